@@ -0,0 +1,115 @@
+"""Python library to access a Solar-Log JSON interface."""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    # explicit re-exports (X as X), as __all__ is only built at runtime
+    # pylint: disable=useless-import-alias
+    from .solarlog_backfill import SolarLogBackfill as SolarLogBackfill
+    from .solarlog_buffer import SolarLogBuffer as SolarLogBuffer
+    from .solarlog_cache import SolarLogCache as SolarLogCache
+    from .solarlog_client import (
+        Client as Client,
+        ClientConfig as ClientConfig,
+        SolarLogQuery as SolarLogQuery,
+    )
+    from .solarlog_connector import SolarLogConnector as SolarLogConnector
+    from .solarlog_exceptions import (
+        SolarLogAuthenticationError as SolarLogAuthenticationError,
+        SolarLogCircuitOpenError as SolarLogCircuitOpenError,
+        SolarLogConnectionError as SolarLogConnectionError,
+        SolarLogError as SolarLogError,
+        SolarLogUpdateError as SolarLogUpdateError,
+    )
+    from .solarlog_fleet import (
+        FleetResult as FleetResult,
+        SolarLogFleet as SolarLogFleet,
+    )
+    from .solarlog_influx import (
+        InfluxFileWriter as InfluxFileWriter,
+        InfluxLineBuffer as InfluxLineBuffer,
+        InfluxSocketWriter as InfluxSocketWriter,
+    )
+    from .solarlog_models import (
+        EnergyHistory as EnergyHistory,
+        HistoryRow as HistoryRow,
+        InverterData as InverterData,
+        InverterSnapshot as InverterSnapshot,
+        RequestMetrics as RequestMetrics,
+        SolarlogData as SolarlogData,
+        SolarlogSnapshot as SolarlogSnapshot,
+        diff as diff,
+    )
+    from .solarlog_mqtt import SolarLogMqttPublisher as SolarLogMqttPublisher
+    from .solarlog_prometheus import SolarLogExporter as SolarLogExporter
+    from .solarlog_retry import (
+        CircuitBreaker as CircuitBreaker,
+        RetryPolicy as RetryPolicy,
+    )
+    from .solarlog_scheduler import AdaptivePoller as AdaptivePoller
+    from .solarlog_storage import SolarLogStorage as SolarLogStorage
+    from .solarlog_sync import (
+        BackgroundLoop as BackgroundLoop,
+        SyncSolarLogConnector as SyncSolarLogConnector,
+        update_many as update_many,
+    )
+
+# public names and their modules, which are only imported on first access,
+# so importing the package does not load aiohttp or mashumaro
+_EXPORTS: dict[str, str] = {
+    "SolarLogBackfill": "solarlog_backfill",
+    "SolarLogBuffer": "solarlog_buffer",
+    "SolarLogCache": "solarlog_cache",
+    "Client": "solarlog_client",
+    "ClientConfig": "solarlog_client",
+    "SolarLogQuery": "solarlog_client",
+    "SolarLogConnector": "solarlog_connector",
+    "SolarLogAuthenticationError": "solarlog_exceptions",
+    "SolarLogCircuitOpenError": "solarlog_exceptions",
+    "SolarLogConnectionError": "solarlog_exceptions",
+    "SolarLogError": "solarlog_exceptions",
+    "SolarLogUpdateError": "solarlog_exceptions",
+    "FleetResult": "solarlog_fleet",
+    "SolarLogFleet": "solarlog_fleet",
+    "InfluxFileWriter": "solarlog_influx",
+    "InfluxLineBuffer": "solarlog_influx",
+    "InfluxSocketWriter": "solarlog_influx",
+    "EnergyHistory": "solarlog_models",
+    "HistoryRow": "solarlog_models",
+    "InverterData": "solarlog_models",
+    "InverterSnapshot": "solarlog_models",
+    "RequestMetrics": "solarlog_models",
+    "SolarlogData": "solarlog_models",
+    "SolarlogSnapshot": "solarlog_models",
+    "diff": "solarlog_models",
+    "SolarLogMqttPublisher": "solarlog_mqtt",
+    "SolarLogExporter": "solarlog_prometheus",
+    "CircuitBreaker": "solarlog_retry",
+    "RetryPolicy": "solarlog_retry",
+    "AdaptivePoller": "solarlog_scheduler",
+    "SolarLogStorage": "solarlog_storage",
+    "BackgroundLoop": "solarlog_sync",
+    "SyncSolarLogConnector": "solarlog_sync",
+    "update_many": "solarlog_sync",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """Import public name from its module on first access."""
+
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_EXPORTS])
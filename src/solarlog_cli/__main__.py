@@ -0,0 +1,183 @@
+"""Command line interface to access Solar-Log."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from typing import TYPE_CHECKING, Any, TextIO
+
+if TYPE_CHECKING:
+    from .solarlog_fleet import FleetResult, SolarLogFleet
+
+# heavy modules (aiohttp, mashumaro) are only imported when a command runs,
+# so the command starts fast, e.g. for "solarlog --help" or in cron jobs
+
+
+def _parser() -> argparse.ArgumentParser:
+    """Create parser for command line arguments."""
+
+    parser = argparse.ArgumentParser(
+        prog="solarlog",
+        description="Read data from one or more Solar-Logs, output as NDJSON.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("hosts", nargs="+", metavar="HOST", help="e.g. http://solarlog")
+    common.add_argument("-p", "--password", default="", help="password of user")
+    common.add_argument(
+        "-c", "--concurrency", type=int, default=50, help="max. concurrent requests"
+    )
+
+    data = argparse.ArgumentParser(add_help=False)
+    data.add_argument(
+        "-e", "--extended", action="store_true", help="include extended data"
+    )
+    data.add_argument("--tz", default="", help="timezone of Solar-Log, e.g. Europe/Zurich")
+
+    subparsers.add_parser("get", parents=[common, data], help="get data once")
+    subparsers.add_parser("devices", parents=[common], help="get list of devices")
+    watch = subparsers.add_parser(
+        "watch", parents=[common, data], help="poll data in an interval"
+    )
+    watch.add_argument(
+        "-i", "--interval", type=float, default=60, help="poll interval in seconds"
+    )
+    watch.add_argument(
+        "-n", "--count", type=int, default=0, help="stop after count results (0: never)"
+    )
+
+    return parser
+
+
+def _write(output: TextIO, line: dict[str, Any]) -> None:
+    """Write one line of NDJSON."""
+    output.write(json.dumps(line, default=str) + "\n")
+    output.flush()
+
+
+def _result_line(result: FleetResult) -> dict[str, Any]:
+    """Create output line for result of a Solar-Log."""
+    if result.error is not None or result.data is None:
+        return {"host": result.host, "error": str(result.error)}
+    return {"host": result.host, "data": result.data.to_dict()}
+
+
+async def _create_fleet(args: argparse.Namespace, extended: bool) -> SolarLogFleet:
+    """Create fleet with all Solar-Logs (and their device lists for extended data)."""
+
+    # pylint: disable-next=import-outside-toplevel
+    from .solarlog_fleet import SolarLogFleet
+
+    fleet = SolarLogFleet(max_concurrent_polls=args.concurrency)
+    for host in args.hosts:
+        fleet.add_host(
+            host,
+            interval=getattr(args, "interval", 0),
+            extended_data=extended,
+            tz=getattr(args, "tz", ""),
+            password=args.password,
+        )
+
+    if extended:
+        await asyncio.gather(
+            *(_update_device_list(fleet, host) for host in fleet.hosts),
+            return_exceptions=True,
+        )
+
+    return fleet
+
+
+async def _update_device_list(fleet: SolarLogFleet, host: str) -> dict[int, str]:
+    """Update device list of Solar-Log and enable all devices."""
+
+    connector = fleet.connector(host)
+    devices = await connector.update_device_list()
+    connector.set_enabled_devices({key: True for key in devices})
+
+    return {key: value.name for key, value in devices.items()}
+
+
+async def _get(args: argparse.Namespace, output: TextIO) -> int:
+    """Get data of all Solar-Logs once."""
+
+    fleet = await _create_fleet(args, args.extended)
+    errors = 0
+
+    try:
+        async for result in fleet.poll_once():
+            errors += result.error is not None
+            _write(output, _result_line(result))
+    finally:
+        await fleet.close()
+
+    return 1 if errors else 0
+
+
+async def _devices(args: argparse.Namespace, output: TextIO) -> int:
+    """Get device lists of all Solar-Logs."""
+
+    # pylint: disable-next=import-outside-toplevel
+    from .solarlog_exceptions import SolarLogError
+
+    fleet = await _create_fleet(args, False)
+    errors = 0
+
+    async def get_devices(host: str) -> dict[str, Any]:
+        fleet.connector(host).extended_data = True
+        try:
+            return {"host": host, "devices": await _update_device_list(fleet, host)}
+        except SolarLogError as err:
+            return {"host": host, "error": str(err)}
+
+    try:
+        for task in asyncio.as_completed([get_devices(host) for host in fleet.hosts]):
+            line = await task
+            errors += "error" in line
+            _write(output, line)
+    finally:
+        await fleet.close()
+
+    return 1 if errors else 0
+
+
+async def _watch(args: argparse.Namespace, output: TextIO) -> int:
+    """Poll data of all Solar-Logs in an interval."""
+
+    fleet = await _create_fleet(args, args.extended)
+    count = 0
+
+    try:
+        async for result in fleet.poll():
+            _write(output, _result_line(result))
+            count += 1
+            if count == args.count:
+                break
+    finally:
+        await fleet.close()
+
+    return 0
+
+
+COMMANDS = {
+    "get": _get,
+    "devices": _devices,
+    "watch": _watch,
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run command line interface."""
+
+    args = _parser().parse_args(argv)
+
+    try:
+        return asyncio.run(COMMANDS[args.command](args, sys.stdout))
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
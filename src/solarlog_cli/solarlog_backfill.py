@@ -0,0 +1,96 @@
+"""Incremental backfill of Solar-Log history with checkpoints in SQLite."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+from datetime import datetime
+import sqlite3
+
+from .solarlog_client import DAILY_ENERGY_PER_INVERTER_HISTORY, Client
+from .solarlog_models import HistoryRow
+
+
+class SolarLogBackfill:
+    """Backfill of history data objects resuming from a checkpoint per host.
+
+    The checkpoint is the date of the last row processed by the caller. Solar-Log
+    can not be asked for a range of dates, so rows up to the checkpoint are skipped
+    while the response is streamed and only missing rows are yielded. A row counts
+    as processed once the caller requests the next one, the latest row (e.g. the
+    current day) may still change and is therefore yielded again by the next run.
+    """
+
+    def __init__(self, database: str = ":memory:", commit_interval: int = 100) -> None:
+        self.commit_interval: int = commit_interval
+
+        self._connection = sqlite3.connect(database)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            "host TEXT NOT NULL, object_id TEXT NOT NULL, date TEXT NOT NULL, "
+            "PRIMARY KEY (host, object_id))"
+        )
+        self._connection.commit()
+
+    def checkpoint(
+        self, host: str, object_id: str = DAILY_ENERGY_PER_INVERTER_HISTORY
+    ) -> datetime | None:
+        """Date of the last processed row of data object (None if not yet backfilled)."""
+
+        row = self._connection.execute(
+            "SELECT date FROM checkpoints WHERE host = ? AND object_id = ?",
+            (host, object_id),
+        ).fetchone()
+
+        return None if row is None else datetime.fromisoformat(row[0])
+
+    def _set_checkpoint(self, host: str, object_id: str, date: datetime) -> None:
+        """Store date of the last processed row (committed later)."""
+
+        self._connection.execute(
+            "INSERT INTO checkpoints (host, object_id, date) VALUES (?, ?, ?) "
+            "ON CONFLICT (host, object_id) DO UPDATE SET date = excluded.date",
+            (host, object_id, date.isoformat()),
+        )
+
+    def reset(self, host: str, object_id: str | None = None) -> None:
+        """Remove checkpoint of data object (or all of host), next run starts over."""
+
+        if object_id is None:
+            self._connection.execute("DELETE FROM checkpoints WHERE host = ?", (host,))
+        else:
+            self._connection.execute(
+                "DELETE FROM checkpoints WHERE host = ? AND object_id = ?",
+                (host, object_id),
+            )
+        self._connection.commit()
+
+    async def backfill(
+        self, client: Client, object_id: str = DAILY_ENERGY_PER_INVERTER_HISTORY
+    ) -> AsyncGenerator[HistoryRow, None]:
+        """Yield rows of history data object missing since the last run."""
+
+        checkpoint = self.checkpoint(client.host, object_id)
+        previous: HistoryRow | None = None
+        pending = 0
+
+        try:
+            async for row in client.iter_history(object_id):
+                if checkpoint is not None and row.date <= checkpoint:
+                    continue
+
+                if previous is not None:
+                    # the caller requested the next row, so previous is processed
+                    self._set_checkpoint(client.host, object_id, previous.date)
+                    pending += 1
+                    if pending >= self.commit_interval:
+                        self._connection.commit()
+                        pending = 0
+
+                yield row
+                previous = row
+        finally:
+            self._connection.commit()
+
+    def close(self) -> None:
+        """Close SQLite database."""
+        self._connection.close()
@@ -0,0 +1,167 @@
+"""Columnar ring buffer for data polled from Solar-Log."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+import math
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+from .solarlog_models import SolarlogData
+
+DEFAULT_COLUMNS: tuple[str, ...] = (
+    "power_ac",
+    "power_dc",
+    "consumption_ac",
+    "voltage_ac",
+    "voltage_dc",
+    "yield_day",
+    "consumption_day",
+    "power_available",
+)
+
+
+class SolarLogBuffer:
+    """Ring buffer storing polled data in fixed-size typed columns.
+
+    Every column holds one float per snapshot (NaN if the value is None), the
+    snapshots are keyed by the timestamp of last_updated. NumPy is used for the
+    window queries if installed, array('d') otherwise. Once the buffer is full,
+    the oldest snapshot is overwritten.
+    """
+
+    def __init__(
+        self, capacity: int = 8640, columns: tuple[str, ...] = DEFAULT_COLUMNS
+    ) -> None:
+        self.capacity: int = capacity
+        self.columns: tuple[str, ...] = columns
+
+        self._timestamps: Any = self._column()
+        self._data: dict[str, Any] = {name: self._column() for name in columns}
+        self._next: int = 0
+        self._size: int = 0
+
+    def _column(self) -> Any:
+        """Create empty column."""
+        if np is not None:
+            return np.full(self.capacity, math.nan)
+        return array("d", [math.nan]) * self.capacity
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_updated(self) -> float | None:
+        """Timestamp of the latest snapshot."""
+        if self._size == 0:
+            return None
+        return float(self._timestamps[self._next - 1])
+
+    def append(self, data: SolarlogData) -> bool:
+        """Append data, return False if data is not newer than the latest snapshot."""
+
+        timestamp = data.last_updated.timestamp()
+        last_updated = self.last_updated
+        if last_updated is not None and timestamp <= last_updated:
+            return False
+
+        self._timestamps[self._next] = timestamp
+        for name, column in self._data.items():
+            value = getattr(data, name)
+            column[self._next] = math.nan if value is None else value
+
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+        return True
+
+    def _ordered(self, column: Any) -> Any:
+        """Return values of column from the oldest to the latest snapshot."""
+
+        start = (self._next - self._size) % self.capacity
+        if start + self._size <= self.capacity:
+            return column[start : start + self._size]
+        if np is not None:
+            return np.concatenate((column[start:], column[: self._next]))
+        return column[start:] + column[: self._next]
+
+    def timestamps(self) -> Any:
+        """Timestamps of all snapshots from the oldest to the latest."""
+        return self._ordered(self._timestamps)
+
+    def column(self, name: str) -> Any:
+        """Values of column for all snapshots from the oldest to the latest."""
+        return self._ordered(self._data[name])
+
+    def window(self, name: str, seconds: float, end: float | None = None) -> tuple[Any, Any]:
+        """Timestamps and values of column within seconds before end.
+
+        End defaults to the latest snapshot, so the clock of Solar-Log does not
+        need to be in sync with the local clock.
+        """
+
+        if end is None:
+            end = self.last_updated
+            if end is None:
+                return self.timestamps(), self.column(name)
+
+        timestamps = self.timestamps()
+        if np is not None:
+            first = int(np.searchsorted(timestamps, end - seconds))
+            last = int(np.searchsorted(timestamps, end, side="right"))
+        else:
+            first = bisect_left(timestamps, end - seconds)
+            last = bisect_left(timestamps, math.nextafter(end, math.inf))
+
+        return timestamps[first:last], self.column(name)[first:last]
+
+    def mean(self, name: str, seconds: float, end: float | None = None) -> float | None:
+        """Mean of column within seconds before end (None if there are no values)."""
+
+        values = self._values(self.window(name, seconds, end)[1])
+        if len(values) == 0:
+            return None
+        if np is not None:
+            return float(np.mean(values))
+        return math.fsum(values) / len(values)
+
+    def max(self, name: str, seconds: float, end: float | None = None) -> float | None:
+        """Maximum of column within seconds before end (None if there are no values)."""
+
+        values = self._values(self.window(name, seconds, end)[1])
+        if len(values) == 0:
+            return None
+        return float(max(values) if np is None else np.max(values))
+
+    def integrate(self, name: str, seconds: float, end: float | None = None) -> float:
+        """Integral of column over time within seconds before end (per hour).
+
+        Uses the trapezoidal rule, e.g. power in W is integrated to energy in Wh.
+        Intervals with missing values are skipped.
+        """
+
+        timestamps, values = self.window(name, seconds, end)
+        if len(values) < 2:
+            return 0.0
+
+        if np is not None:
+            areas = (values[1:] + values[:-1]) / 2 * np.diff(timestamps)
+            return float(np.nansum(areas)) / 3600
+
+        return math.fsum(
+            (values[i] + values[i - 1]) / 2 * (timestamps[i] - timestamps[i - 1])
+            for i in range(1, len(values))
+            if not math.isnan(values[i] + values[i - 1])
+        ) / 3600
+
+    @staticmethod
+    def _values(values: Any) -> Any:
+        """Values without missing values (NaN)."""
+        if np is not None:
+            return values[~np.isnan(values)]
+        return [value for value in values if not math.isnan(value)]
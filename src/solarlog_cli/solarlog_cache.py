@@ -0,0 +1,70 @@
+"""Cache for slowly changing data objects of Solar-Log."""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Any
+
+# data objects which change at most daily and their default time to live (in s)
+DEFAULT_TTL: dict[str, float] = {
+    "141": 86400,  # inverter names
+    "740": 86400,  # list of inverters
+    "854": 3600,  # yearly energy per inverter
+    "878": 3600,  # yearly energy
+}
+
+
+class SolarLogCache:
+    """Cache with a time to live per data object.
+
+    Only data objects with a time to live are cached, the entries are stored
+    per (sub-)query, e.g. the names of different inverters are cached separately.
+    """
+
+    def __init__(self, ttl: dict[str, float] | None = None) -> None:
+        self.ttl: dict[str, float] = DEFAULT_TTL.copy() if ttl is None else ttl
+        self._data: dict[tuple[str, str], tuple[float, Any]] = {}
+
+    @staticmethod
+    def _key(object_id: str, query: Any) -> tuple[str, str]:
+        """Key of the cache entry for query of data object."""
+        return (object_id, json.dumps(query, sort_keys=True))
+
+    def get(self, object_id: str, query: Any = None) -> Any | None:
+        """Get cached value of data object (None if not cached or expired)."""
+
+        if object_id not in self.ttl:
+            return None
+
+        key = self._key(object_id, query)
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._data[key]
+            return None
+
+        return value
+
+    def set(self, object_id: str, query: Any, value: Any) -> None:
+        """Store value of data object (ignored for data objects without time to live)."""
+
+        ttl = self.ttl.get(object_id)
+        # string values are error messages like "QUERY IMPOSSIBLE 000"
+        if ttl is None or isinstance(value, str):
+            return
+
+        self._data[self._key(object_id, query)] = (time.monotonic() + ttl, value)
+
+    def invalidate(self, object_id: str | None = None) -> None:
+        """Invalidate cached values of data object (or all if no object_id is provided)."""
+
+        if object_id is None:
+            self._data.clear()
+            return
+
+        for key in [key for key in self._data if key[0] == object_id]:
+            del self._data[key]
@@ -2,62 +2,416 @@
 
 from __future__ import annotations
 
+from array import array
 import asyncio
+from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator
+import codecs
+from dataclasses import dataclass, replace
 from datetime import datetime
 import json
 import logging
-from typing import Any
+import time
+from typing import TYPE_CHECKING, Any, Callable
 
-from aiohttp import ClientResponse, ClientSession, ClientTimeout
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
+from .solarlog_cache import SolarLogCache
 from .solarlog_exceptions import (
     SolarLogAuthenticationError,
+    SolarLogCircuitOpenError,
     SolarLogConnectionError,
     SolarLogUpdateError,
 )
 
-from .solarlog_models import SolarlogData
+from .solarlog_models import EnergyHistory, HistoryRow, RequestMetrics, SolarlogData
+from .solarlog_retry import CircuitBreaker, RetryPolicy
+
+if TYPE_CHECKING:
+    # aiohttp is imported on first use, as loading it is slow
+    from aiohttp import ClientResponse, ClientSession, ClientTimeout
 
 SOLARLOG_REQUEST_PAYLOAD = '{ "801": { "170": null } }'
+
+BASIC_DATA_QUERY: dict[str, Any] = {"801": {"170": None}}
+DEVICE_LIST_QUERY: dict[str, Any] = {"740": None}
+ENERGY_QUERY: dict[str, Any] = {"878": None}
+POWER_PER_INVERTER_QUERY: dict[str, Any] = {"782": None}
+ENERGY_PER_INVERTER_QUERY: dict[str, Any] = {"854": None}
+
+# history data objects, one row per day, month or year
+DAILY_ENERGY_PER_INVERTER_HISTORY = "777"
+MONTHLY_ENERGY_PER_INVERTER_HISTORY = "779"
+YEARLY_ENERGY_PER_INVERTER_HISTORY = "854"
+MONTHLY_ENERGY_HISTORY = "877"
+YEARLY_ENERGY_HISTORY = "878"
+
+# bytes at the beginning of a response scanned for QUERY IMPOSSIBLE
+ERROR_MARKER_SCAN_LENGTH = 256
+# bytes read at once when streaming history data objects
+HISTORY_CHUNK_SIZE = 16384
+
+JsonDecoder = Callable[[bytes | str], Any]
+
+# use orjson if installed (optional dependency "speedups")
+# pylint: disable-next=no-member
+DEFAULT_JSON_DECODER: JsonDecoder = json.loads if orjson is None else orjson.loads
+
 _LOGGER = logging.getLogger(__name__)
 
+
+def _is_utf8(body: bytes) -> bool:
+    """Check if body is valid UTF-8."""
+    try:
+        body.decode("utf-8")
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _decode_text(body: bytes) -> str:
+    """Decode body of response for error messages."""
+    return body.decode("utf-8", errors="replace")
+
+
+def merge_queries(target: dict[str, Any], query: dict[str, Any]) -> dict[str, Any]:
+    """Merge a data object query into target (in place) and return target."""
+    for key, value in query.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            merge_queries(target[key], value)
+        elif isinstance(value, dict) and key not in target:
+            target[key] = merge_queries({}, value)
+        else:
+            # null requests the whole object, which covers any sub-query
+            target[key] = None
+
+    return target
+
+
+def extract_response(query: dict[str, Any], response: dict[str, Any]) -> dict[str, Any]:
+    """Extract the part of a (combined) response belonging to query."""
+    data: dict[str, Any] = {}
+
+    for key, value in query.items():
+        if key not in response:
+            continue
+        if isinstance(value, dict) and isinstance(response[key], dict):
+            data[key] = extract_response(value, response[key])
+        else:
+            data[key] = response[key]
+
+    return data
+
+
+def parse_basic_data(raw_data: dict[str, Any]) -> SolarlogData:
+    """Parse basic data (801/170) from Solar-Log response."""
+    raw_data = raw_data["801"]["170"]
+
+    return SolarlogData(
+        last_updated = datetime.strptime(raw_data["100"], "%d.%m.%y %H:%M:%S"),
+        power_ac = raw_data["101"],
+        power_dc = raw_data["102"],
+        voltage_ac = raw_data["103"],
+        voltage_dc = raw_data["104"],
+        yield_day = raw_data["105"],
+        yield_yesterday = raw_data["106"],
+        yield_month = raw_data["107"],
+        yield_year = raw_data["108"],
+        yield_total = raw_data["109"],
+        consumption_ac = raw_data["110"],
+        consumption_day = raw_data["111"],
+        consumption_yesterday = raw_data["112"],
+        consumption_month = raw_data["113"],
+        consumption_year = raw_data["114"],
+        consumption_total = raw_data["115"],
+        total_power = raw_data["116"],
+    )
+
+
+def parse_power_per_inverter(raw_data: dict[str, Any]) -> dict[int, float]:
+    """Parse power per inverter (782) from Solar-Log response."""
+    return {int(key): val for key, val in raw_data["782"].items() if val != "0"}
+
+
+def parse_energy_per_inverter(raw_data: dict[str, Any]) -> dict[int, float]:
+    """Parse energy of the current year per inverter (854) from Solar-Log response."""
+    return {
+        index: item
+        for index, item in enumerate(raw_data["854"][-1][-1])
+        if item != 0
+    }
+
+
+def parse_energy_history_per_inverter(raw_data: dict[str, Any]) -> EnergyHistory:
+    """Parse energy of all years per inverter (854) from Solar-Log response."""
+    history = EnergyHistory()
+
+    for row, (date, values) in enumerate(raw_data["854"]):
+        history.dates.append(datetime.strptime(date, "%d.%m.%y"))
+        for index, value in enumerate(values):
+            energy = history.energy.get(index)
+            if energy is None:
+                # inverter added later, no values for the previous years
+                energy = history.energy[index] = array("d", [0.0]) * row
+            energy.append(value)
+        for index in range(len(values), len(history.energy)):
+            # inverter removed, no value for this year
+            history.energy[index].append(0)
+
+    return history
+
+
+def parse_history_row(row: list[Any]) -> HistoryRow:
+    """Parse row of a history data object (e.g. 777 or 877)."""
+    date = datetime.strptime(row[0], "%d.%m.%y")
+    if len(row) == 2 and isinstance(row[1], list):
+        # values per inverter
+        return HistoryRow(date, tuple(row[1]))
+    return HistoryRow(date, tuple(row[1:]))
+
+
+class _ChunkReader:
+    """Reader decoding JSON values one by one from the chunks of a response."""
+
+    def __init__(self, chunks: AsyncIterable[bytes]) -> None:
+        self._chunks: AsyncIterator[bytes] = aiter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._json_decoder = json.JSONDecoder()
+        self._buffer: str = ""
+        self._pos: int = 0
+
+    async def _fill(self) -> bool:
+        """Read next chunk into buffer (False if the response is complete)."""
+        chunk = await anext(self._chunks, None)
+        if chunk is None:
+            return False
+        self._buffer = self._buffer[self._pos:] + self._text_decoder.decode(chunk)
+        self._pos = 0
+        return True
+
+    async def next_char(self, skip: str = " \t\r\n") -> str:
+        """Skip characters and return next character (without consuming it)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in skip:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not await self._fill():
+                raise SolarLogUpdateError("Incomplete response from Solar-Log.")
+
+    async def expect(self, char: str) -> None:
+        """Consume char, raise if the next character is a different one."""
+        if await self.next_char() != char:
+            raise SolarLogUpdateError(
+                f"Unexpected server response: {self._buffer[self._pos:self._pos + 64]}"
+            )
+        self._pos += 1
+
+    async def decode(self) -> Any:
+        """Decode next JSON value (arrays, objects or strings only)."""
+        await self.next_char()
+        while True:
+            try:
+                value, self._pos = self._json_decoder.raw_decode(self._buffer, self._pos)
+            except ValueError as err:
+                # value not yet complete
+                if not await self._fill():
+                    msg = f"Value error while decoding response: {err}."
+                    raise SolarLogUpdateError(msg) from err
+            else:
+                return value
+
+
+async def iter_history_rows(
+    chunks: AsyncIterable[bytes], object_id: str
+) -> AsyncIterator[list[Any]]:
+    """Parse rows of a history data object incrementally from the chunks of a response.
+
+    Only one row is decoded at a time, so the whole (possibly large) nested list
+    is never kept in memory.
+    """
+    reader = _ChunkReader(chunks)
+
+    await reader.expect("{")
+    key = await reader.decode()
+    if key != object_id:
+        # e.g. {"QUERY IMPOSSIBLE 000"}
+        raise SolarLogUpdateError(f"Server response: {key}")
+    await reader.expect(":")
+
+    if await reader.next_char() != "[":
+        value = await reader.decode()
+        if value == "ACCESS DENIED":
+            raise SolarLogAuthenticationError(f"Server response: {value}")
+        raise SolarLogUpdateError(f"Server response: {value}")
+    await reader.expect("[")
+
+    while await reader.next_char(" \t\r\n,") != "]":
+        yield await reader.decode()
+
+
+def parse_energy(raw_data: dict[str, Any], data: SolarlogData) -> SolarlogData:
+    """Parse yearly energy data (878) from Solar-Log response into data."""
+    if raw_data["878"] != "QUERY IMPOSSIBLE 000":
+        data.production_year = raw_data["878"][-1][1]
+        data.self_consumption_year = raw_data["878"][-1][3]
+
+    return data
+
+
+class SolarLogQuery:
+    """Query builder combining several data object requests into a single request.
+
+    Each added query is merged into one JSON payload, which is sent to Solar-Log
+    in one round trip. The response is split up again and handed to the parser
+    registered with the respective query.
+    """
+
+    def __init__(self, client: Client) -> None:
+        self.client: Client = client
+        self._queries: list[tuple[dict[str, Any], Callable[[dict[str, Any]], Any] | None]] = []
+
+    def add(
+        self,
+        query: dict[str, Any],
+        parser: Callable[[dict[str, Any]], Any] | None = None,
+    ) -> SolarLogQuery:
+        """Add a data object request (and optional parser for its response)."""
+        self._queries.append((query, parser))
+        return self
+
+    @property
+    def payload(self) -> dict[str, Any]:
+        """Combined payload of all added queries."""
+        payload: dict[str, Any] = {}
+        for query, _ in self._queries:
+            merge_queries(payload, query)
+        return payload
+
+    async def execute(self) -> list[Any]:
+        """Send the combined request and return the parsed results in order of adding."""
+        raw_data = await self.client.get_objects(self.payload)
+
+        results: list[Any] = []
+        for query, parser in self._queries:
+            data = extract_response(query, raw_data)
+            results.append(parser(data) if parser is not None else data)
+
+        return results
+
+
+@dataclass
+class ClientConfig:
+    """Timeouts and connection settings of Client (all times in s)."""
+
+    # pylint: disable=too-many-instance-attributes
+
+    request_timeout: float = 30
+    connect_timeout: float | None = None
+    read_timeout: float | None = None
+    # time to keep idle connections open for reuse
+    keepalive_timeout: float = 15
+    limit: int = 10
+    limit_per_host: int = 2
+    # time to cache DNS lookups (None: forever)
+    dns_cache_ttl: int | None = 300
+
+    def timeout(self) -> ClientTimeout:
+        """Create timeout of requests."""
+        # pylint: disable-next=import-outside-toplevel
+        from aiohttp import ClientTimeout
+
+        return ClientTimeout(
+            total=self.request_timeout,
+            connect=self.connect_timeout,
+            sock_read=self.read_timeout,
+        )
+
+    def create_session(self) -> ClientSession:
+        """Create client session with a connector tuned for polling."""
+        # pylint: disable-next=import-outside-toplevel
+        from aiohttp import ClientSession, TCPConnector
+
+        return ClientSession(
+            connector=TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+            ),
+            timeout=self.timeout(),
+        )
+
+
 class Client:
     """Client class to access Solar-Log."""
 
-    # pylint: disable=too-many-positional-arguments
+    # pylint: disable=too-many-instance-attributes,too-many-positional-arguments
 
-    def __init__(self, host: str, session: ClientSession | None, password: str = "") -> None:
+    def __init__(
+        self,
+        host: str,
+        session: ClientSession | None,
+        password: str = "",
+        config: ClientConfig | None = None,
+    ) -> None:
         self.host: str = host
         self.password: str = password
         self.token: str = ""
 
-        self.request_timeout = 30
+        # copied, as request_timeout changes the config and it may be shared
+        self.config: ClientConfig = ClientConfig() if config is None else replace(config)
+        # built once and reused for every request
+        self._timeout: ClientTimeout = self.config.timeout()
+
+        # number of inverter names fetched per request (0: all in one request)
+        self.device_names_per_request: int = 0
+        # max. number of requests sent to Solar-Log concurrently
+        self.max_concurrent_requests: int = 2
+        # optional cache for slowly changing data objects
+        self.cache: SolarLogCache | None = None
+        # function to decode JSON responses
+        self.json_decoder: JsonDecoder = DEFAULT_JSON_DECODER
+        # optional retry of requests failing with connection errors
+        self.retry_policy: RetryPolicy | None = None
+        # optional circuit breaker refusing requests while Solar-Log is unreachable
+        self.circuit_breaker: CircuitBreaker | None = None
+
+        self._observers: list[Callable[[RequestMetrics], None]] = []
+        self._login_lock = asyncio.Lock()
 
         if not session:
-            self.session = ClientSession()
+            self.session = self.config.create_session()
         else:
             self.session = session
 
         self._close_session: bool = True
 
+    @property
+    def request_timeout(self) -> float:
+        """Total timeout of requests (in s)."""
+        return self.config.request_timeout
+
+    @request_timeout.setter
+    def request_timeout(self, value: float) -> None:
+        self.config.request_timeout = value
+        self._timeout = self.config.timeout()
 
     async def test_connection(self) -> bool:
         """Test the connection to Solar-Log."""
         if self.session is None:
-            self.session = ClientSession()
+            self.session = self.config.create_session()
             self._close_session = True
 
         url = f"{self.host}/getjp"
 
-        response = await self.session.post(
+        async with self.session.post(
             url, json=SOLARLOG_REQUEST_PAYLOAD,
-            timeout=ClientTimeout(total=self.request_timeout)
-        )
-
-        if response.status == 200:
-            return True
-
-        return False
+            timeout=self._timeout,
+        ) as response:
+            return response.status == 200
 
     async def login(self) -> bool:
         """Test the connection to Solar-Log."""
@@ -85,10 +439,17 @@ class Client:
 
         return True
 
-    async def execute_http_request(self, body: str, path: str = "getjp") -> ClientResponse:
-        """Helper function to process the HTTP Get call."""
+    async def execute_http_request(
+        self, body: str, path: str = "getjp", stream: bool = False
+    ) -> ClientResponse:
+        """Helper function to process the HTTP Get call.
+
+        The body of the response is read before the response is returned, which
+        returns the connection to the pool. With stream, the body is left to be
+        read by the caller, who has to release the response.
+        """
         if self.session is None:
-            self.session = ClientSession()
+            self.session = self.config.create_session()
             self._close_session = True
 
         url = f"{self.host}/{path}"
@@ -101,16 +462,7 @@ class Client:
         _LOGGER.debug("HTTP-request header: %s",header)
         _LOGGER.debug("HTTP-request body: %s", body)
 
-        try:
-            response = await self.session.post(
-                url=url,
-                headers=header,
-                data=body,
-                timeout=ClientTimeout(total=self.request_timeout),
-            )
-        except asyncio.TimeoutError as exception:
-            msg = f"Timeout occurred while connecting to Solar-Log at {self.host}"
-            raise SolarLogConnectionError(msg) from exception
+        response = await self._post_with_retry(url, header, body, stream)
 
         content_type = response.headers.get("Content-Type", "")
 
@@ -126,20 +478,103 @@ class Client:
         _LOGGER.debug("HTTP-request successful: %s",response)
         return response
 
+    async def _post_with_retry(
+        self, url: str, header: dict[str, str], body: str, stream: bool
+    ) -> ClientResponse:
+        """Send request, retry on connection errors according to the retry policy."""
+        # pylint: disable-next=import-outside-toplevel
+        from aiohttp import ClientConnectionError, ClientPayloadError
+
+        attempt = 0
+        while True:
+            if self.circuit_breaker is not None and not self.circuit_breaker.allow():
+                raise SolarLogCircuitOpenError(
+                    f"Solar-Log at {self.host} failed repeatedly, request refused"
+                )
+
+            try:
+                response = await self._post(url, header, body, stream)
+            except (
+                asyncio.TimeoutError, ClientConnectionError, ClientPayloadError
+            ) as exception:
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_failure()
+                if self.retry_policy is None or attempt >= self.retry_policy.retries:
+                    if isinstance(exception, asyncio.TimeoutError):
+                        msg = f"Timeout occurred while connecting to Solar-Log at {self.host}"
+                    else:
+                        msg = f"Error occurred while connecting to Solar-Log at {self.host}"
+                    raise SolarLogConnectionError(msg) from exception
+
+                delay = self.retry_policy.delay(attempt)
+                attempt += 1
+                _LOGGER.debug("Retry request to %s in %.1f s", self.host, delay)
+                await asyncio.sleep(delay)
+            else:
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_success()
+                return response
+
+    async def _post(
+        self, url: str, header: dict[str, str], body: str, stream: bool
+    ) -> ClientResponse:
+        """Send request and read the whole body (unless streamed)."""
+
+        response = await self.session.post(
+            url=url,
+            headers=header,
+            data=body,
+            timeout=self._timeout,
+        )
+        if stream and response.status == 200:
+            return response
+
+        try:
+            # reading to the end returns the connection to the pool
+            await response.read()
+        except BaseException:
+            response.close()
+            raise
+
+        return response
+
     async def parse_http_response(self, response: ClientResponse) -> dict[str, Any]:
         """Helper function to parse the HTTP response."""
 
-        text = await response.text()
-        _LOGGER.debug("Parsing http response: %s",text)
+        body = await response.read()
+        _LOGGER.debug("Parsing http response: %s",body)
 
-        if text.count('{"QUERY IMPOSSIBLE 000"}'):
-            raise SolarLogUpdateError(f"Server response: {text}")
+        # an impossible query is answered with this error only, so only the
+        # beginning of the body is scanned
+        if b'{"QUERY IMPOSSIBLE 000"}' in body[:ERROR_MARKER_SCAN_LENGTH]:
+            raise SolarLogUpdateError(f"Server response: {_decode_text(body)}")
 
-        if text.count("ACCESS DENIED"):
-            raise SolarLogAuthenticationError(f"Server response: {text}")
+        # denied data objects can follow others (combined queries), so the whole
+        # body is scanned (on bytes, without decoding it)
+        if b"ACCESS DENIED" in body:
+            raise SolarLogAuthenticationError(f"Server response: {_decode_text(body)}")
 
         try:
-            json_response = json.loads(text)
+            json_response = self.json_decoder(body)
+        except ValueError as err:
+            if not _is_utf8(body):
+                # decode with charset of response and retry
+                return self._parse_text(
+                    body.decode(response.get_encoding(), errors="replace")
+                )
+            msg = f"Value error while decoding response: {err}."
+            raise SolarLogUpdateError(
+                msg,
+                {"Server response": _decode_text(body)},
+            ) from err
+
+        return json_response
+
+    def _parse_text(self, text: str) -> dict[str, Any]:
+        """Helper function to parse a decoded HTTP response."""
+
+        try:
+            json_response = self.json_decoder(text)
         except ValueError as err:
             msg = f"Value error while decoding response: {err}."
             raise SolarLogUpdateError(
@@ -149,96 +584,194 @@ class Client:
 
         return json_response
 
+    def query(self) -> SolarLogQuery:
+        """Create a query builder to fetch several data objects in one request."""
+        return SolarLogQuery(self)
+
+    async def get_objects(self, query: dict[str, Any]) -> dict[str, Any]:
+        """Get the requested data objects from Solar-Log."""
+
+        if self.cache is None:
+            return await self._request_objects(query)
+
+        cached_data: dict[str, Any] = {}
+        for key, value in query.items():
+            cached_value = self.cache.get(key, value)
+            if cached_value is not None:
+                cached_data[key] = cached_value
+
+        query = {key: value for key, value in query.items() if key not in cached_data}
+        if not query:
+            return cached_data
+
+        raw_data = await self._request_objects(query)
+        for key, value in query.items():
+            if key in raw_data:
+                self.cache.set(key, value, raw_data[key])
+
+        return raw_data | cached_data
+
+    async def _request_objects(self, query: dict[str, Any]) -> dict[str, Any]:
+        """Request data objects from Solar-Log, log in again if the token expired."""
+
+        token = self.token
+
+        try:
+            return await self._fetch_objects(query)
+        except SolarLogAuthenticationError:
+            if self.password == "":
+                raise
+            await self._relogin(token)
+
+        return await self._fetch_objects(query)
+
+    async def _relogin(self, expired_token: str) -> None:
+        """Log in again, unless another request did so in the meantime."""
+
+        async with self._login_lock:
+            if self.token != expired_token:
+                return
+            _LOGGER.debug("Access denied, log in to Solar-Log again")
+            self.token = ""
+            if not await self.login():
+                raise SolarLogAuthenticationError("Login to Solar-Log not possible.")
+
+    async def _fetch_objects(self, query: dict[str, Any]) -> dict[str, Any]:
+        """Request data objects from Solar-Log and report metrics to observers."""
+
+        if not self._observers:
+            return await self.parse_http_response(
+                await self.execute_http_request(json.dumps(query))
+            )
+
+        metrics = RequestMetrics(self.host, tuple(query))
+        start = time.perf_counter()
+
+        try:
+            response = await self.execute_http_request(json.dumps(query))
+            metrics.size = len(await response.read())
+            metrics.latency = time.perf_counter() - start
+
+            start = time.perf_counter()
+            raw_data = await self.parse_http_response(response)
+            metrics.parse_time = time.perf_counter() - start
+        except Exception as err:
+            metrics.error = type(err)
+            if not metrics.latency:
+                metrics.latency = time.perf_counter() - start
+            raise
+        finally:
+            for observer in self._observers:
+                observer(metrics)
+
+        return raw_data
+
+    def add_observer(self, observer: Callable[[RequestMetrics], None]) -> Callable[[], None]:
+        """Add observer called with the metrics of every request (returns function to remove it)."""
+
+        self._observers.append(observer)
+
+        def remove_observer() -> None:
+            self._observers.remove(observer)
+
+        return remove_observer
+
     async def get_basic_data(self) -> SolarlogData:
         """Get basic data from Solar-Log."""
 
-        raw_data: dict[str, Any] = await self.parse_http_response(
-            await self.execute_http_request(SOLARLOG_REQUEST_PAYLOAD)
-        )
-        raw_data = raw_data["801"]["170"]
-
-        data = SolarlogData(
-            last_updated = datetime.strptime(raw_data["100"], "%d.%m.%y %H:%M:%S"),
-            power_ac = raw_data["101"],
-            power_dc = raw_data["102"],
-            voltage_ac = raw_data["103"],
-            voltage_dc = raw_data["104"],
-            yield_day = raw_data["105"],
-            yield_yesterday = raw_data["106"],
-            yield_month = raw_data["107"],
-            yield_year = raw_data["108"],
-            yield_total = raw_data["109"],
-            consumption_ac = raw_data["110"],
-            consumption_day = raw_data["111"],
-            consumption_yesterday = raw_data["112"],
-            consumption_month = raw_data["113"],
-            consumption_year = raw_data["114"],
-            consumption_total = raw_data["115"],
-            total_power = raw_data["116"],
-        )
-
-        return data
+        return parse_basic_data(await self.get_objects(BASIC_DATA_QUERY))
 
     async def get_power_per_inverter(self) -> dict[int, float]:
         """Get power data from Solar-Log"""
 
-        raw_data: dict = await self.parse_http_response(
-            await self.execute_http_request('{ "782": null }')
-        )
-
-        data = {int(key): val for key, val in raw_data["782"].items() if val != "0"}
-
-        return data
+        return parse_power_per_inverter(await self.get_objects(POWER_PER_INVERTER_QUERY))
 
     async def get_energy_per_inverter(self) -> dict[int, float]:
         """Get power data from Solar-Log"""
 
-        raw_data: dict = await self.parse_http_response(
-            await self.execute_http_request('{ "854": null }')
-        )
-        data_list = raw_data["854"][-1][-1]
-
-        data: dict[int, float] = {}
+        return parse_energy_per_inverter(await self.get_objects(ENERGY_PER_INVERTER_QUERY))
 
-        for item in data_list:
-            if item != 0:
-                data |= {int(data_list.index(item)): item}
+    async def get_energy_history_per_inverter(self) -> EnergyHistory:
+        """Get energy of all years per inverter from Solar-Log"""
 
-        return data
+        return parse_energy_history_per_inverter(
+            await self.get_objects(ENERGY_PER_INVERTER_QUERY)
+        )
 
     async def get_energy(self, data: SolarlogData) -> SolarlogData:
         """Get energy data from Solar-Log"""
 
-        raw_data: dict = await self.parse_http_response(
-            await self.execute_http_request('{ "878": null }')
-        )
+        return parse_energy(await self.get_objects(ENERGY_QUERY), data)
+
+    async def iter_history(self, object_id: str) -> AsyncGenerator[HistoryRow, None]:
+        """Get rows of a history data object (e.g. 777) from Solar-Log one by one.
 
-        if raw_data["878"] != "QUERY IMPOSSIBLE 000":
-            data.production_year = raw_data["878"][-1][1]
-            data.self_consumption_year = raw_data["878"][-1][3]
+        The response is parsed while it is received, bypassing cache and observers.
+        """
 
-        return data
+        token = self.token
+
+        try:
+            async for row in self._iter_history(object_id):
+                yield row
+            return
+        except SolarLogAuthenticationError:
+            # raised before the first row, so no row is yielded twice
+            if self.password == "":
+                raise
+            await self._relogin(token)
+
+        async for row in self._iter_history(object_id):
+            yield row
+
+    async def _iter_history(self, object_id: str) -> AsyncGenerator[HistoryRow, None]:
+        """Request history data object and parse its rows incrementally."""
+
+        response = await self.execute_http_request(
+            json.dumps({object_id: None}), stream=True
+        )
+        try:
+            async for row in iter_history_rows(
+                response.content.iter_chunked(HISTORY_CHUNK_SIZE), object_id
+            ):
+                yield parse_history_row(row)
+        finally:
+            response.release()
 
     async def get_device_list(self) -> dict[int, str]:
         """Get list of all connected devices."""
 
         # get list of all inverters connected to Solar-Log
-        raw_data: dict = await self.parse_http_response(
-            await self.execute_http_request('{ "740": null }')
-        )
+        raw_data: dict = await self.get_objects(DEVICE_LIST_QUERY)
         raw_data = raw_data["740"]
 
-        device_list: dict[int, str] = {}
+        device_ids = [key for key, value in raw_data.items() if value != "Err"]
+        if not device_ids:
+            return {}
+
+        # get names of the inverters, bundled into as few requests as allowed
+        chunk_size = self.device_names_per_request or len(device_ids)
+        semaphore = asyncio.Semaphore(max(self.max_concurrent_requests, 1))
 
-        for key, value in raw_data.items():
-            if value != "Err":
-                # get name of the inverter
-                raw_data = await self.parse_http_response(
-                    await self.execute_http_request(
-                        f"""{{ "141": {{ "{key}": {{ "119": null }} }} }}"""
-                    )
+        async def get_names(keys: list[str]) -> dict[str, Any]:
+            async with semaphore:
+                raw_data = await self.get_objects(
+                    {"141": {key: {"119": None} for key in keys}}
                 )
-                device_list |= {int(key): raw_data["141"][key]["119"]}
+            return raw_data["141"]
+
+        results = await asyncio.gather(
+            *(
+                get_names(device_ids[i:i + chunk_size])
+                for i in range(0, len(device_ids), chunk_size)
+            )
+        )
+
+        device_list: dict[int, str] = {}
+
+        for names in results:
+            for key, value in names.items():
+                device_list |= {int(key): value["119"]}
 
         return device_list
 
@@ -1,18 +1,34 @@
 """Connector class to manage access to Solar-Log."""
 
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+from dataclasses import replace
 from datetime import timezone, tzinfo
 import logging
-from zoneinfo import ZoneInfo
-
-from aiohttp import ClientSession
-
-from .solarlog_client import Client
+from typing import TYPE_CHECKING, Any
+
+from .solarlog_client import (
+    BASIC_DATA_QUERY,
+    ENERGY_PER_INVERTER_QUERY,
+    ENERGY_QUERY,
+    POWER_PER_INVERTER_QUERY,
+    Client,
+    ClientConfig,
+    parse_basic_data,
+    parse_energy,
+    parse_energy_per_inverter,
+    parse_power_per_inverter,
+)
 from .solarlog_exceptions import(
     SolarLogAuthenticationError,
     SolarLogConnectionError,
     SolarLogUpdateError,
 )
-from .solarlog_models import SolarlogData, InverterData
+from .solarlog_models import HistoryRow, SolarlogData, InverterData, diff
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,8 +47,9 @@ class SolarLogConnector:
         device_enabled: dict[int, bool] | None = None,
         password: str = "",
         session: ClientSession | None = None,
+        client_config: ClientConfig | None = None,
     ):
-        self.client = Client(host, session, password)
+        self.client = Client(host, session, password, client_config)
         self.extended_data: bool = extended_data
 
         self._device_list: dict[int, InverterData] = {}
@@ -42,7 +59,16 @@ class SolarLogConnector:
         for key, value in device_enabled.items():
             self._device_list |= {key: InverterData(enabled=value)}
 
-        self.timezone: tzinfo = timezone.utc if tz == "" else ZoneInfo(tz)
+        self.timezone: tzinfo = timezone.utc
+        if tz != "":
+            # zoneinfo is only imported if needed, as loading it is slow
+            # pylint: disable-next=import-outside-toplevel
+            from zoneinfo import ZoneInfo
+
+            self.timezone = ZoneInfo(tz)
+
+        # snapshot of the data returned by the last call of update_data_delta
+        self._previous_data: SolarlogData | None = None
 
     async def test_connection(self) -> bool:
         """Test if connection to Solar-Log works."""
@@ -79,7 +105,17 @@ class SolarLogConnector:
     async def update_data(self) -> SolarlogData:
         """Get data from Solar-Log."""
 
-        data: SolarlogData = await self.client.get_basic_data()
+        # fetch all required data objects in one single request
+        query = self.client.query().add(BASIC_DATA_QUERY, parse_basic_data)
+        with_inverter_data = self.extended_data and self._device_list != {}
+        if self.extended_data:
+            query.add(ENERGY_QUERY)
+        if with_inverter_data:
+            query.add(POWER_PER_INVERTER_QUERY, parse_power_per_inverter)
+            query.add(ENERGY_PER_INVERTER_QUERY, parse_energy_per_inverter)
+
+        results = await query.execute()
+        data: SolarlogData = results[0]
 
         if data.last_updated.year == 1999:
             raise SolarLogUpdateError(
@@ -90,10 +126,10 @@ class SolarLogConnector:
 
         _LOGGER.debug("Basic data updated: %s",data)
         if self.extended_data:
-            data = await self.client.get_energy(data)
+            data = parse_energy(results[1], data)
 
-            if self._device_list != {}:
-                data.inverter_data = await self.update_inverter_data()
+            if with_inverter_data:
+                data.inverter_data = self._set_inverter_data(results[2], results[3])
 
             _LOGGER.debug("Extended data updated: %s",data)
 
@@ -112,6 +148,36 @@ class SolarLogConnector:
 
         return data
 
+    async def update_data_delta(self) -> dict[str, Any]:
+        """Get data changed since the last call from Solar-Log.
+
+        Returns an empty dict if Solar-Log did not update its data (last_updated is
+        unchanged), all fields on the first call.
+        """
+
+        data = await self.update_data()
+
+        previous = self._previous_data
+        if previous is not None and previous.last_updated == data.last_updated:
+            return {}
+
+        # inverter data is updated in place, keep a copy for the next comparison
+        self._previous_data = replace(
+            data,
+            inverter_data={
+                key: replace(value) for key, value in data.inverter_data.items()
+            },
+        )
+
+        return diff(previous, data)
+
+    async def iter_history(self, object_id: str) -> AsyncGenerator[HistoryRow, None]:
+        """Get rows of a history data object (e.g. 777 for daily energy per inverter)."""
+
+        async for row in self.client.iter_history(object_id):
+            row.date = row.date.replace(tzinfo=self.timezone)
+            yield row
+
     async def update_device_list(self) -> dict[int, InverterData]:
         """Update list of devices."""
         if not self.extended_data:
@@ -130,15 +196,27 @@ class SolarLogConnector:
     async def update_inverter_data(self) -> dict[int, InverterData]:
         """Update device specific data."""
 
-        raw_data = await self.client.get_power_per_inverter()
-        for key, value in raw_data.items():
+        power, energy = await (
+            self.client.query()
+            .add(POWER_PER_INVERTER_QUERY, parse_power_per_inverter)
+            .add(ENERGY_PER_INVERTER_QUERY, parse_energy_per_inverter)
+            .execute()
+        )
+
+        return self._set_inverter_data(power, energy)
+
+    def _set_inverter_data(
+        self, power: dict[int, float], energy: dict[int, float]
+    ) -> dict[int, InverterData]:
+        """Set power and energy values of enabled devices."""
+
+        for key, value in power.items():
             key = int(key)
-            if self._device_list.get(key,InverterData).enabled:
+            if self.device(key).enabled:
                 self._device_list[key].current_power = float(value)
 
-        raw_data = await self.client.get_energy_per_inverter()
-        for key, value in raw_data.items():
-            if self._device_list.get(key,InverterData).enabled:
+        for key, value in energy.items():
+            if self.device(key).enabled:
                 self._device_list[key].consumption_year = float(value)
 
         _LOGGER.debug("Inverter data updated: %s",self._device_list)
@@ -7,6 +7,9 @@ class SolarLogError(Exception):
 class SolarLogConnectionError(SolarLogError):
     """SolarLog connection exception."""
 
+class SolarLogCircuitOpenError(SolarLogConnectionError):
+    """Request refused, as Solar-Log failed repeatedly."""
+
 class SolarLogAuthenticationError(SolarLogError):
     """Exception in login data."""
 
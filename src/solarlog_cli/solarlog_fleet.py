@@ -0,0 +1,164 @@
+"""Fleet class to poll many Solar-Logs on one event loop."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+import heapq
+import logging
+from typing import Any
+
+from aiohttp import ClientSession, TCPConnector
+
+from .solarlog_connector import SolarLogConnector
+from .solarlog_exceptions import SolarLogError, SolarLogUpdateError
+from .solarlog_models import SolarlogData
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class FleetResult:
+    """Result of polling one Solar-Log of the fleet."""
+
+    host: str
+    data: SolarlogData | None = None
+    error: SolarLogError | None = None
+
+
+class SolarLogFleet:
+    """Fleet class to poll many Solar-Logs sharing one client session."""
+
+    # pylint: disable=too-many-arguments
+    # pylint: disable=too-many-positional-arguments
+
+    def __init__(
+        self,
+        max_concurrent_polls: int = 50,
+        session: ClientSession | None = None,
+        limit: int = 100,
+        limit_per_host: int = 2,
+    ) -> None:
+        if not session:
+            self.session = ClientSession(
+                connector=TCPConnector(limit=limit, limit_per_host=limit_per_host)
+            )
+            self._close_session: bool = True
+        else:
+            self.session = session
+            self._close_session = False
+
+        self._semaphore = asyncio.Semaphore(max_concurrent_polls)
+        self._connectors: dict[str, SolarLogConnector] = {}
+        self._intervals: dict[str, float] = {}
+
+        # schedule of next polls: (due time, sequence number, host)
+        self._schedule: list[tuple[float, int, str]] = []
+        self._sequence: int = 0
+
+    def add_host(self, host: str, interval: float = 60, **kwargs: Any) -> SolarLogConnector:
+        """Add a Solar-Log to the fleet (kwargs are passed to SolarLogConnector)."""
+
+        connector = SolarLogConnector(host, session=self.session, **kwargs)
+        self._connectors[host] = connector
+        self._intervals[host] = interval
+        self._schedule_poll(host, 0)
+
+        return connector
+
+    def remove_host(self, host: str) -> None:
+        """Remove a Solar-Log from the fleet."""
+
+        self._connectors.pop(host, None)
+        self._intervals.pop(host, None)
+
+    def connector(self, host: str) -> SolarLogConnector:
+        """Get connector of a Solar-Log of the fleet."""
+        return self._connectors[host]
+
+    @property
+    def hosts(self) -> list[str]:
+        """Hosts of all Solar-Logs of the fleet."""
+        return list(self._connectors)
+
+    def _schedule_poll(self, host: str, due: float) -> None:
+        """Schedule next poll of host."""
+        self._sequence += 1
+        heapq.heappush(self._schedule, (due, self._sequence, host))
+
+    async def _poll_host(self, host: str, connector: SolarLogConnector) -> FleetResult:
+        """Poll one Solar-Log, limited by the global concurrency cap."""
+
+        async with self._semaphore:
+            try:
+                data = await connector.update_data()
+            except SolarLogError as err:
+                error = err
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                # e.g. malformed data of one Solar-Log, which must not stop the fleet
+                error = SolarLogUpdateError(f"Polling {host} failed: {err!r}")
+                error.__cause__ = err
+            else:
+                return FleetResult(host, data=data)
+
+        _LOGGER.debug("Polling %s failed: %s", host, error)
+        return FleetResult(host, error=error)
+
+    async def poll_once(self) -> AsyncIterator[FleetResult]:
+        """Poll all Solar-Logs once and yield the results as they complete."""
+
+        for task in asyncio.as_completed(
+            [self._poll_host(host, connector) for host, connector in self._connectors.items()]
+        ):
+            yield await task
+
+    async def poll(self) -> AsyncIterator[FleetResult]:
+        """Poll all Solar-Logs in their intervals and yield the results as they complete.
+
+        Every host is polled again `interval` seconds after its previous poll completed,
+        so a slow Solar-Log is never polled concurrently with itself.
+        """
+
+        loop = asyncio.get_running_loop()
+        tasks: dict[asyncio.Task[FleetResult], str] = {}
+        running: set[str] = set()
+
+        try:
+            while self._connectors or tasks:
+                now = loop.time()
+
+                while self._schedule and self._schedule[0][0] <= now:
+                    _, _, host = heapq.heappop(self._schedule)
+                    connector = self._connectors.get(host)
+                    if connector is None or host in running:
+                        continue
+                    tasks[asyncio.create_task(self._poll_host(host, connector))] = host
+                    running.add(host)
+
+                timeout = self._schedule[0][0] - now if self._schedule else None
+
+                if not tasks:
+                    if timeout is None:
+                        return
+                    await asyncio.sleep(timeout)
+                    continue
+
+                done, _ = await asyncio.wait(
+                    tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    host = tasks.pop(task)
+                    running.discard(host)
+                    if host in self._intervals:
+                        self._schedule_poll(host, loop.time() + self._intervals[host])
+                    yield task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def close(self) -> None:
+        """Close shared client session."""
+        if self._close_session:
+            await self.session.close()
@@ -0,0 +1,144 @@
+"""InfluxDB line protocol encoder for data polled from Solar-Log."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import fields
+from pathlib import Path
+
+from .solarlog_models import SolarlogData
+
+MEASUREMENT = "solarlog"
+INVERTER_MEASUREMENT = "solarlog_inverter"
+
+# field keys of the numeric fields of SolarlogData, precomputed as "<name>="
+FIELD_KEYS: tuple[tuple[str, str], ...] = tuple(
+    (item.name, f"{item.name}=")
+    for item in fields(SolarlogData)
+    if item.name not in ("last_updated", "inverter_data")
+)
+INVERTER_FIELD_KEYS: tuple[tuple[str, str], ...] = (
+    ("current_power", "current_power="),
+    ("consumption_year", "consumption_year="),
+)
+
+InfluxWriter = Callable[[bytes], Awaitable[None]]
+
+
+def _escape_tag(value: str) -> str:
+    """Escape tag value (or measurement)."""
+    return value.replace("\\", "\\\\").replace(",", "\\,").replace("=", "\\=").replace(" ", "\\ ")
+
+
+def _fields(data: object, keys: tuple[tuple[str, str], ...]) -> str:
+    """Field set of data (fields with value None are omitted)."""
+    return ",".join(
+        f"{key}{value!r}"
+        for name, key in keys
+        if (value := getattr(data, name)) is not None
+    )
+
+
+class InfluxLineBuffer:
+    """Buffer collecting data of many Solar-Logs in line protocol before flushing.
+
+    The tags of hosts and inverters are escaped once and cached, every snapshot
+    is appended to one bytes buffer, which is handed to a writer on flush.
+    """
+
+    def __init__(self, max_size: int = 1 << 20) -> None:
+        # size (in bytes) at which add() signals a flush is due
+        self.max_size: int = max_size
+
+        self._buffer = bytearray()
+        self._host_tags: dict[str, str] = {}
+        self._inverter_tags: dict[tuple[str, int, str], str] = {}
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def add(self, host: str, data: SolarlogData) -> bool:
+        """Append data of host, return True if the buffer should be flushed."""
+
+        tags = self._host_tags.get(host)
+        if tags is None:
+            tags = self._host_tags[host] = f"{MEASUREMENT},host={_escape_tag(host)} "
+        timestamp = f" {int(data.last_updated.timestamp())}000000000\n"
+
+        lines = [tags, _fields(data, FIELD_KEYS), timestamp]
+
+        for key, value in data.inverter_data.items():
+            field_set = _fields(value, INVERTER_FIELD_KEYS)
+            if not field_set:
+                continue
+            inverter_tags = self._inverter_tags.get((host, key, value.name))
+            if inverter_tags is None:
+                inverter_tags = self._inverter_tags[(host, key, value.name)] = (
+                    f"{INVERTER_MEASUREMENT},host={_escape_tag(host)},device_id={key}"
+                    + (f",name={_escape_tag(value.name)} " if value.name else " ")
+                )
+            lines += (inverter_tags, field_set, timestamp)
+
+        self._buffer += "".join(lines).encode()
+
+        return len(self._buffer) >= self.max_size
+
+    def getvalue(self) -> bytes:
+        """Buffered lines."""
+        return bytes(self._buffer)
+
+    def clear(self) -> None:
+        """Remove all buffered lines."""
+        self._buffer.clear()
+
+    async def flush(self, writer: InfluxWriter) -> None:
+        """Hand buffered lines to writer and clear the buffer."""
+
+        if not self._buffer:
+            return
+
+        data = self.getvalue()
+        self.clear()
+        await writer(data)
+
+
+class InfluxFileWriter:
+    """Writer appending lines to a file (written on a thread)."""
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, path: str | Path) -> None:
+        self.path: Path = Path(path)
+
+    def _append(self, data: bytes) -> None:
+        with self.path.open("ab") as file:
+            file.write(data)
+
+    async def __call__(self, data: bytes) -> None:
+        await asyncio.to_thread(self._append, data)
+
+
+class InfluxSocketWriter:
+    """Writer sending lines to a TCP socket (e.g. Telegraf socket_listener)."""
+
+    def __init__(self, host: str, port: int) -> None:
+        self.host: str = host
+        self.port: int = port
+
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def __call__(self, data: bytes) -> None:
+        if self._writer is None or self._writer.is_closing():
+            _, self._writer = await asyncio.open_connection(self.host, self.port)
+
+        self._writer.write(data)
+        await self._writer.drain()
+
+    async def close(self) -> None:
+        """Close connection."""
+
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+            self._writer = None
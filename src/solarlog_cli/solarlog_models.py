@@ -1,10 +1,13 @@
 """Models for SolarLog."""
-from dataclasses import dataclass, field
+from array import array
+from dataclasses import dataclass, field, fields
 from datetime import datetime
+from typing import Any
 
 from mashumaro import DataClassDictMixin
+from mashumaro.config import BaseConfig
 
-@dataclass
+@dataclass(slots=True)
 class InverterData():
     """Inverter Data model."""
 
@@ -14,12 +17,59 @@ class InverterData():
     consumption_year: float | None= None
 
 
+@dataclass(frozen=True, slots=True)
+class InverterSnapshot():
+    """Immutable and hashable Inverter Data model."""
+
+    name: str = ""
+    enabled: bool = False
+    current_power: float | None = None
+    consumption_year: float | None= None
+
+
 @dataclass
+class RequestMetrics():
+    """Timing and size of a request to Solar-Log."""
+
+    host: str
+    objects: tuple[str, ...]
+    latency: float = 0
+    size: int = 0
+    parse_time: float = 0
+    error: type[Exception] | None = None
+
+
+@dataclass
+class EnergyHistory():
+    """Yearly energy per inverter model."""
+
+    dates: list[datetime] = field(default_factory=list)
+    # one value per date for every inverter
+    energy: dict[int, array] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class HistoryRow():
+    """Row of a history data object (e.g. energy of one day)."""
+
+    date: datetime
+    # one value per inverter or total values, depending on data object
+    values: tuple[float, ...] = ()
+
+
+@dataclass(slots=True)
 class SolarlogData(DataClassDictMixin):
     """Basic Data model."""
 
     # pylint: disable=too-many-instance-attributes
 
+    class Config(BaseConfig):
+        """Compile to_dict and from_dict on first use, not on import."""
+
+        # pylint: disable=too-few-public-methods
+
+        lazy_compilation = True
+
     consumption_ac: float
     consumption_day: float
     consumption_month: float
@@ -49,3 +99,95 @@ class SolarlogData(DataClassDictMixin):
     inverter_data: dict[int, InverterData] = field(default_factory=dict)
     production_year: float | None = None
     self_consumption_year: float | None = None
+
+    def snapshot(self) -> "SolarlogSnapshot":
+        """Return immutable and hashable copy of data."""
+
+        values = {item.name: getattr(self, item.name) for item in fields(self)}
+        values["inverter_data"] = tuple(
+            (key, InverterSnapshot(*(getattr(value, item.name) for item in fields(value))))
+            for key, value in sorted(self.inverter_data.items())
+        )
+        return SolarlogSnapshot(**values)
+
+
+@dataclass(frozen=True, slots=True)
+class SolarlogSnapshot(DataClassDictMixin):
+    """Immutable and hashable Basic Data model, e.g. to keep histories of data.
+
+    Has the fields of SolarlogData (in the same order), apart from inverter_data.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    class Config(BaseConfig):
+        """Compile to_dict and from_dict on first use, not on import."""
+
+        # pylint: disable=too-few-public-methods
+
+        lazy_compilation = True
+
+    consumption_ac: float
+    consumption_day: float
+    consumption_month: float
+    consumption_total: float
+    consumption_yesterday: float
+    consumption_year: float
+    last_updated: datetime
+    power_ac: float
+    power_dc: float
+    total_power: float
+    voltage_ac: float
+    voltage_dc: float
+    yield_day: float
+    yield_yesterday: float
+    yield_month: float
+    yield_year: float
+    yield_total: float
+
+    #calculated values
+    alternator_loss: float = 0
+    capacity: float | None = None
+    efficiency: float | None = None
+    power_available: float = 0
+    usage: float | None = None
+
+    #extended data, pairs of device id and data sorted by id
+    inverter_data: tuple[tuple[int, InverterSnapshot], ...] = ()
+    production_year: float | None = None
+    self_consumption_year: float | None = None
+
+
+def _changed_fields(previous: Any, current: Any, exclude: str = "") -> dict[str, Any]:
+    """Return values of all fields of current differing from previous."""
+
+    return {
+        item.name: getattr(current, item.name)
+        for item in fields(current)
+        if item.name != exclude
+        and (
+            previous is None
+            or getattr(previous, item.name) != getattr(current, item.name)
+        )
+    }
+
+
+def diff(previous: SolarlogData | None, current: SolarlogData) -> dict[str, Any]:
+    """Return fields changed from previous to current data.
+
+    Changed inverters are returned in inverter_data (by device id) with their changed
+    fields only. If there is no previous data, all fields are returned.
+    """
+
+    changes = _changed_fields(previous, current, exclude="inverter_data")
+
+    previous_inverters = {} if previous is None else previous.inverter_data
+    inverter_changes = {
+        key: changed
+        for key, value in current.inverter_data.items()
+        if (changed := _changed_fields(previous_inverters.get(key), value))
+    }
+    if inverter_changes:
+        changes["inverter_data"] = inverter_changes
+
+    return changes
@@ -0,0 +1,118 @@
+"""MQTT publisher for data polled from Solar-Log."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import fields
+import logging
+from typing import Any, Protocol
+
+from .solarlog_connector import SolarLogConnector
+from .solarlog_models import SolarlogData
+
+_LOGGER = logging.getLogger(__name__)
+
+# fields of SolarlogData published to <topic>/<field>
+PUBLISHED_FIELDS: tuple[str, ...] = tuple(
+    item.name for item in fields(SolarlogData) if item.name != "inverter_data"
+)
+PUBLISHED_INVERTER_FIELDS: tuple[str, ...] = ("current_power", "consumption_year")
+
+
+class MqttClient(Protocol):
+    """MQTT client (e.g. aiomqtt.Client) used by the publisher."""
+
+    # pylint: disable=too-few-public-methods
+
+    async def publish(
+        self, topic: str, payload: Any = None, qos: int = 0, retain: bool = False
+    ) -> Any:
+        """Publish payload to topic."""
+
+
+class SolarLogMqttPublisher:
+    """Publisher sending every field of the data to its own topic when changed.
+
+    Changes are collected per topic until flush(), so a topic changing several
+    times in between is published only once with its latest value. A flush sends
+    all pending publishes concurrently (at most max_in_flight at a time).
+    """
+
+    def __init__(
+        self,
+        client: MqttClient,
+        qos: int = 0,
+        retain: bool = True,
+        max_in_flight: int = 100,
+    ) -> None:
+        self.client: MqttClient = client
+        self.qos: int = qos
+        self.retain: bool = retain
+        self.max_in_flight: int = max_in_flight
+
+        self._published: dict[str, str] = {}
+        self._pending: dict[str, str] = {}
+
+    @property
+    def pending(self) -> dict[str, str]:
+        """Payloads per topic waiting to be published."""
+        return self._pending
+
+    def _set(self, topic: str, value: Any) -> None:
+        """Set payload of topic if changed."""
+
+        payload = "" if value is None else str(value)
+        if self._published.get(topic) == payload:
+            # unchanged or changed back before it was published
+            self._pending.pop(topic, None)
+        else:
+            self._pending[topic] = payload
+
+    def set_data(self, topic: str, data: SolarlogData) -> None:
+        """Set data of a Solar-Log published below topic."""
+
+        for name in PUBLISHED_FIELDS:
+            value = getattr(data, name)
+            self._set(
+                f"{topic}/{name}", value.isoformat() if name == "last_updated" else value
+            )
+
+        for key, inverter in data.inverter_data.items():
+            if not inverter.enabled:
+                continue
+            for name in PUBLISHED_INVERTER_FIELDS:
+                self._set(f"{topic}/inverter/{key}/{name}", getattr(inverter, name))
+
+    async def flush(self) -> int:
+        """Publish all pending changes, return number of published topics.
+
+        Failed publishes stay pending (unless the topic changed in the meantime).
+        """
+
+        pending, self._pending = self._pending, {}
+        semaphore = asyncio.Semaphore(max(self.max_in_flight, 1))
+
+        async def publish(topic: str, payload: str) -> bool:
+            async with semaphore:
+                try:
+                    await self.client.publish(
+                        topic, payload, qos=self.qos, retain=self.retain
+                    )
+                except Exception as err:  # pylint: disable=broad-exception-caught
+                    _LOGGER.debug("Publishing %s failed: %s", topic, err)
+                    self._pending.setdefault(topic, payload)
+                    return False
+            self._published[topic] = payload
+            return True
+
+        results = await asyncio.gather(
+            *(publish(topic, payload) for topic, payload in pending.items())
+        )
+
+        return sum(results)
+
+    async def update(self, connector: SolarLogConnector, topic: str) -> int:
+        """Poll connector and publish changed data below topic."""
+
+        self.set_data(topic, await connector.update_data())
+        return await self.flush()
@@ -0,0 +1,178 @@
+"""Prometheus exporter for data polled from Solar-Log."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import fields
+import logging
+
+from aiohttp import web
+
+from .solarlog_connector import SolarLogConnector
+from .solarlog_exceptions import SolarLogError
+from .solarlog_models import SolarlogData
+
+_LOGGER = logging.getLogger(__name__)
+
+METRIC_PREFIX = "solarlog_"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# numeric fields of SolarlogData exported as gauges
+METRIC_FIELDS: tuple[str, ...] = tuple(
+    item.name
+    for item in fields(SolarlogData)
+    if item.name not in ("last_updated", "inverter_data")
+)
+LAST_UPDATED_METRIC = f"{METRIC_PREFIX}last_updated_timestamp_seconds"
+INVERTER_POWER_METRIC = f"{METRIC_PREFIX}inverter_current_power"
+
+
+def _escape(value: str) -> str:
+    """Escape label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _header(metric: str, description: str) -> str:
+    """HELP and TYPE lines of a gauge."""
+    return f"# HELP {metric} {description}\n# TYPE {metric} gauge\n"
+
+
+class SolarLogExporter:
+    """aiohttp server exposing the latest data of Solar-Logs at /metrics.
+
+    The sample lines of a host are rendered once per update from cached label
+    templates, the response body is only rebuilt if any host was updated since
+    the last scrape.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9523) -> None:
+        self.connectors: dict[str, SolarLogConnector] = {}
+
+        self._host: str = host
+        self._port: int = port
+        self._runner: web.AppRunner | None = None
+
+        self._headers: dict[str, str] = {
+            f"{METRIC_PREFIX}{name}": _header(f"{METRIC_PREFIX}{name}", name)
+            for name in METRIC_FIELDS
+        }
+        self._headers[LAST_UPDATED_METRIC] = _header(
+            LAST_UPDATED_METRIC, "Time of the last update of Solar-Log"
+        )
+        self._headers[INVERTER_POWER_METRIC] = _header(
+            INVERTER_POWER_METRIC, "Current power per inverter"
+        )
+
+        # label templates per host and per (host, device id, name)
+        self._labels: dict[str, str] = {}
+        self._inverter_labels: dict[tuple[str, int, str], str] = {}
+        # rendered samples per metric and host
+        self._samples: dict[str, dict[str, str]] = {metric: {} for metric in self._headers}
+        self._body: bytes | None = None
+
+        self.app = web.Application()
+        self.app.router.add_get("/metrics", self._handle_metrics)
+
+    def add_connector(self, connector: SolarLogConnector) -> None:
+        """Add connector polled by update()."""
+        self.connectors[connector.host] = connector
+
+    def set_data(self, host: str, data: SolarlogData) -> None:
+        """Set latest data of host."""
+
+        labels = self._labels.get(host)
+        if labels is None:
+            labels = self._labels[host] = f'{{host="{_escape(host)}"}} '
+
+        for name in METRIC_FIELDS:
+            value = getattr(data, name)
+            samples = self._samples[f"{METRIC_PREFIX}{name}"]
+            if value is None:
+                samples.pop(host, None)
+            else:
+                samples[host] = f"{METRIC_PREFIX}{name}{labels}{value}\n"
+
+        self._samples[LAST_UPDATED_METRIC][host] = (
+            f"{LAST_UPDATED_METRIC}{labels}{data.last_updated.timestamp()}\n"
+        )
+
+        inverter_samples: list[str] = []
+        for key, value in data.inverter_data.items():
+            if value.current_power is None:
+                continue
+            inverter_labels = self._inverter_labels.get((host, key, value.name))
+            if inverter_labels is None:
+                inverter_labels = self._inverter_labels[(host, key, value.name)] = (
+                    f'{{host="{_escape(host)}",device_id="{key}",'
+                    f'name="{_escape(value.name)}"}} '
+                )
+            inverter_samples.append(
+                f"{INVERTER_POWER_METRIC}{inverter_labels}{value.current_power}\n"
+            )
+        self._samples[INVERTER_POWER_METRIC][host] = "".join(inverter_samples)
+
+        self._body = None
+
+    def remove(self, host: str) -> None:
+        """Remove connector and data of host."""
+
+        self.connectors.pop(host, None)
+        for samples in self._samples.values():
+            samples.pop(host, None)
+        self._labels.pop(host, None)
+        for key in [key for key in self._inverter_labels if key[0] == host]:
+            del self._inverter_labels[key]
+        self._body = None
+
+    async def update(self) -> None:
+        """Poll all connectors concurrently and set their data."""
+
+        async def update_host(connector: SolarLogConnector) -> None:
+            try:
+                self.set_data(connector.host, await connector.update_data())
+            except SolarLogError as err:
+                _LOGGER.debug("Updating %s failed: %s", connector.host, err)
+
+        await asyncio.gather(
+            *(update_host(connector) for connector in self.connectors.values())
+        )
+
+    def render(self) -> bytes:
+        """Render latest data of all hosts in Prometheus text format."""
+
+        if self._body is None:
+            self._body = "".join(
+                self._headers[metric] + "".join(samples.values())
+                for metric, samples in self._samples.items()
+                if samples
+            ).encode()
+
+        return self._body
+
+    async def _handle_metrics(self, _request: web.Request) -> web.Response:
+        """Handle scrape requests."""
+        return web.Response(body=self.render(), headers={"Content-Type": CONTENT_TYPE})
+
+    @property
+    def url(self) -> str:
+        """URL of the exporter."""
+        return f"http://{self._host}:{self._port}"
+
+    async def start(self) -> None:
+        """Start the exporter (on a free port if port is 0)."""
+
+        # pylint: disable=duplicate-code
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self._host, self._port)
+        await site.start()
+        self._port = self._runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        """Stop the exporter."""
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,86 @@
+"""Retry policy and circuit breaker for requests to Solar-Log."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import random
+import time
+
+
+@dataclass
+class RetryPolicy:
+    """Retry of requests failing with connection errors, with jittered backoff."""
+
+    retries: int = 2
+    base_delay: float = 0.5
+    max_delay: float = 10
+
+    def delay(self, attempt: int) -> float:
+        """Delay before retry after attempt (0 for the first request), full jitter."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+class CircuitBreaker:
+    """Circuit breaker of one Solar-Log.
+
+    After failure_threshold consecutive connection errors the circuit opens and
+    requests are refused, except one probe per recovery_time. Every failed probe
+    doubles the recovery time (up to max_recovery_time), a successful request
+    closes the circuit again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_time: float = 60,
+        max_recovery_time: float = 900,
+    ) -> None:
+        self.failure_threshold: int = failure_threshold
+        self.recovery_time: float = recovery_time
+        self.max_recovery_time: float = max_recovery_time
+
+        self.failures: int = 0
+        self._current_recovery_time: float = recovery_time
+        # time until requests are refused (None if circuit is closed)
+        self._open_until: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """Circuit is open (requests are refused apart from probes)."""
+        return self._open_until is not None
+
+    def allow(self) -> bool:
+        """Check if a request may be sent (reserves the probe if circuit is open)."""
+
+        if self._open_until is None:
+            return True
+
+        now = time.monotonic()
+        if now < self._open_until:
+            return False
+
+        # probe, the next one is allowed after the recovery time at the earliest
+        self._open_until = now + self._current_recovery_time
+        return True
+
+    def record_success(self) -> None:
+        """Record successful request, close circuit."""
+
+        self.failures = 0
+        self._current_recovery_time = self.recovery_time
+        self._open_until = None
+
+    def record_failure(self) -> None:
+        """Record failed request, open circuit after too many failures."""
+
+        self.failures += 1
+
+        if self._open_until is not None:
+            # failed probe
+            self._current_recovery_time = min(
+                self._current_recovery_time * 2, self.max_recovery_time
+            )
+        elif self.failures < self.failure_threshold:
+            return
+
+        self._open_until = time.monotonic() + self._current_recovery_time
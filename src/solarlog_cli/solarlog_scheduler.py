@@ -0,0 +1,113 @@
+"""Scheduler to poll Solar-Log aligned to its update cycle."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+import logging
+import time
+
+from .solarlog_connector import SolarLogConnector
+from .solarlog_exceptions import SolarLogAuthenticationError, SolarLogError
+from .solarlog_models import SolarlogData
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AdaptivePoller:
+    """Poller learning the update cycle of Solar-Log.
+
+    The refresh cadence is learned from successive values of last_updated, the
+    next poll is timed just after the expected next refresh. While power_dc stays
+    zero (at night), Solar-Log is only polled every night_interval seconds.
+    """
+
+    # pylint: disable=too-many-arguments
+    # pylint: disable=too-many-instance-attributes
+    # pylint: disable=too-many-positional-arguments
+
+    def __init__(
+        self,
+        connector: SolarLogConnector,
+        initial_interval: float = 10,
+        retry_interval: float = 5,
+        max_interval: float = 300,
+        night_interval: float = 900,
+        margin: float = 2,
+        night_polls: int = 3,
+    ) -> None:
+        self.connector: SolarLogConnector = connector
+
+        self.initial_interval: float = initial_interval
+        self.retry_interval: float = retry_interval
+        self.max_interval: float = max_interval
+        self.night_interval: float = night_interval
+        self.margin: float = margin
+        self.night_polls: int = night_polls
+
+        # learned refresh interval of Solar-Log (in s)
+        self.cadence: float | None = None
+
+        self._last_updated: float | None = None
+        # min. difference between local time and last_updated (clock offset plus delay)
+        self._offset: float | None = None
+        self._zero_power_polls: int = 0
+
+    def observe(self, data: SolarlogData, now: float | None = None) -> float:
+        """Learn from polled data and return delay until next poll (in s)."""
+
+        if now is None:
+            now = time.time()
+
+        last_updated = data.last_updated.timestamp()
+
+        offset = now - last_updated
+        if self._offset is None or offset < self._offset:
+            self._offset = offset
+
+        if self._last_updated is not None and last_updated > self._last_updated:
+            interval = last_updated - self._last_updated
+            if self.cadence is None or interval < self.cadence:
+                self.cadence = interval
+            else:
+                # polls may have missed refreshes, adapt only slowly to longer intervals
+                self.cadence += 0.2 * (interval - self.cadence)
+
+        if self._last_updated is None or last_updated > self._last_updated:
+            self._last_updated = last_updated
+
+        self._zero_power_polls = self._zero_power_polls + 1 if data.power_dc == 0 else 0
+        if self._zero_power_polls >= self.night_polls:
+            return self.night_interval
+
+        if self.cadence is None:
+            return self.initial_interval
+
+        delay = self._last_updated + self._offset + self.cadence + self.margin - now
+        if delay <= 0:
+            # expected refresh has not happened yet
+            delay = self.retry_interval
+
+        return min(delay, self.max_interval)
+
+    async def poll(self) -> AsyncIterator[SolarlogData]:
+        """Poll Solar-Log and yield data whenever it was updated."""
+
+        while True:
+            try:
+                data = await self.connector.update_data()
+            except SolarLogAuthenticationError:
+                raise
+            except SolarLogError as err:
+                _LOGGER.debug("Polling %s failed: %s", self.connector.host, err)
+                await asyncio.sleep(self.max_interval)
+                continue
+
+            last_updated = self._last_updated
+            delay = self.observe(data)
+
+            if last_updated is None or data.last_updated.timestamp() > last_updated:
+                yield data
+
+            _LOGGER.debug("Next poll of %s in %.1f s", self.connector.host, delay)
+            await asyncio.sleep(delay)
@@ -0,0 +1,179 @@
+"""SQLite storage for data polled from Solar-Log."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import fields
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from .solarlog_models import SolarlogData
+
+_LOGGER = logging.getLogger(__name__)
+
+# numeric fields of SolarlogData stored per snapshot
+SNAPSHOT_COLUMNS: tuple[str, ...] = tuple(
+    item.name
+    for item in fields(SolarlogData)
+    if item.name not in ("last_updated", "inverter_data")
+)
+
+_CREATE_TABLES = (
+    "CREATE TABLE IF NOT EXISTS snapshots (host TEXT NOT NULL, last_updated TEXT NOT NULL, "
+    + ", ".join(f"{name} REAL" for name in SNAPSHOT_COLUMNS)
+    + ", PRIMARY KEY (host, last_updated))",
+    "CREATE TABLE IF NOT EXISTS inverters (host TEXT NOT NULL, last_updated TEXT NOT NULL, "
+    "device_id INTEGER NOT NULL, name TEXT, current_power REAL, consumption_year REAL, "
+    "PRIMARY KEY (host, last_updated, device_id))",
+)
+_INSERT_SNAPSHOT = (
+    f"INSERT OR REPLACE INTO snapshots (host, last_updated, {', '.join(SNAPSHOT_COLUMNS)}) "
+    f"VALUES (?, ?, {', '.join('?' * len(SNAPSHOT_COLUMNS))})"
+)
+_INSERT_INVERTER = (
+    "INSERT OR REPLACE INTO inverters "
+    "(host, last_updated, device_id, name, current_power, consumption_year) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+_STOP = object()
+
+
+class SolarLogStorage:
+    """Storage writing polled data to SQLite on a background thread.
+
+    write() only queues the data, so the event loop is never blocked by disk I/O.
+    The thread collects the queued data and inserts it with one executemany per
+    table once batch_size snapshots are queued or flush_interval seconds passed.
+    The database is used in WAL mode.
+    """
+
+    def __init__(
+        self, database: str, batch_size: int = 500, flush_interval: float = 5
+    ) -> None:
+        self.database: str = database
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval
+
+        # opened here, so errors (e.g. an invalid path) are raised to the caller,
+        # afterwards the connection is only used by the background thread
+        self._connection = sqlite3.connect(database, check_same_thread=False)
+        try:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in _CREATE_TABLES:
+                self._connection.execute(statement)
+            self._connection.commit()
+        except sqlite3.Error:
+            self._connection.close()
+            raise
+
+        self._queue: queue.Queue[Any] = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name="solarlog-storage", daemon=True
+        )
+        self._thread.start()
+
+    def _check_running(self) -> None:
+        """Raise if the background thread is stopped (closed or failed)."""
+        if not self._thread.is_alive():
+            raise RuntimeError(f"Storage of {self.database} is not running")
+
+    def write(self, host: str, data: SolarlogData) -> None:
+        """Queue data polled from host for writing (only enabled inverters are stored)."""
+
+        self._check_running()
+
+        last_updated = data.last_updated.isoformat()
+        snapshot = (host, last_updated, *(getattr(data, name) for name in SNAPSHOT_COLUMNS))
+        inverters = [
+            (host, last_updated, key, value.name, value.current_power, value.consumption_year)
+            for key, value in data.inverter_data.items()
+            if value.enabled
+        ]
+        self._queue.put((snapshot, inverters))
+
+    async def flush(self) -> None:
+        """Wait until all queued data is written."""
+
+        self._check_running()
+        flushed = threading.Event()
+        self._queue.put(flushed)
+        await asyncio.to_thread(self._wait, flushed)
+
+    def _wait(self, flushed: threading.Event) -> None:
+        """Wait for flushed to be set, raise if the thread stops before."""
+        while not flushed.wait(0.1):
+            self._check_running()
+
+    async def close(self) -> None:
+        """Write queued data and stop the background thread."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            await asyncio.to_thread(self._thread.join)
+
+    def _run(self) -> None:
+        """Collect queued data and write it in batches (runs on background thread)."""
+
+        try:
+            self._collect()
+        finally:
+            self._connection.close()
+
+    def _collect(self) -> None:
+        """Collect queued data until stopped, write it once a batch is due."""
+
+        snapshots: list[tuple[Any, ...]] = []
+        inverters: list[tuple[Any, ...]] = []
+        # flush() calls waiting for the next write
+        flushed: list[threading.Event] = []
+        deadline = time.monotonic() + self.flush_interval
+        stop = False
+
+        while not stop:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                stop = True
+            elif isinstance(item, threading.Event):
+                flushed.append(item)
+            elif item is not None:
+                snapshots.append(item[0])
+                inverters.extend(item[1])
+                if len(snapshots) < self.batch_size and time.monotonic() < deadline:
+                    continue
+            elif time.monotonic() < deadline:
+                continue
+
+            # flush requested, batch complete, interval elapsed or stopped
+            self._write(self._connection, snapshots, inverters)
+            snapshots, inverters = [], []
+            for event in flushed:
+                event.set()
+            flushed = []
+            deadline = time.monotonic() + self.flush_interval
+
+    @staticmethod
+    def _write(
+        connection: sqlite3.Connection,
+        snapshots: list[tuple[Any, ...]],
+        inverters: list[tuple[Any, ...]],
+    ) -> None:
+        """Write batch of snapshots and inverter values in one transaction."""
+
+        if not snapshots:
+            return
+
+        try:
+            with connection:
+                connection.executemany(_INSERT_SNAPSHOT, snapshots)
+                connection.executemany(_INSERT_INVERTER, inverters)
+        except sqlite3.Error:
+            _LOGGER.exception("Writing %s snapshots to SQLite failed", len(snapshots))
@@ -0,0 +1,151 @@
+"""Synchronous access to Solar-Log running connectors on a background event loop."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Coroutine, Iterable
+import threading
+from typing import Any, TypeVar
+
+from .solarlog_connector import SolarLogConnector
+from .solarlog_exceptions import SolarLogError
+from .solarlog_fleet import FleetResult
+from .solarlog_models import InverterData, SolarlogData
+
+_T = TypeVar("_T")
+
+
+class BackgroundLoop:
+    """Event loop running in a background thread, shared by sync connectors."""
+
+    _shared: BackgroundLoop | None = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="solarlog-loop", daemon=True
+        )
+
+        # wait until the loop runs, so is_running() holds once created
+        started = threading.Event()
+        self.loop.call_soon(started.set)
+        self._thread.start()
+        started.wait()
+
+    @classmethod
+    def shared(cls) -> BackgroundLoop:
+        """Get the loop shared by all sync connectors (started on first use)."""
+        with cls._shared_lock:
+            if cls._shared is None or not cls._shared.running:
+                cls._shared = cls()
+            return cls._shared
+
+    @property
+    def running(self) -> bool:
+        """Whether the loop runs (until stopped)."""
+        return self._thread.is_alive()
+
+    def run(self, coro: Coroutine[Any, Any, _T], timeout: float | None = None) -> _T:
+        """Run coroutine on the loop and wait for its result.
+
+        The coroutine is cancelled if it does not complete within timeout.
+        """
+
+        if not self.running:
+            coro.close()
+            raise RuntimeError("Background loop is stopped")
+
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def stop(self) -> None:
+        """Stop the loop and its thread."""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+class SyncSolarLogConnector:
+    """Blocking wrapper of SolarLogConnector.
+
+    The connector and its client session live on a background event loop (shared
+    by default), so loop and session are set up once instead of per call.
+    """
+
+    def __init__(
+        self, host: str, loop: BackgroundLoop | None = None, **kwargs: Any
+    ) -> None:
+        self.background_loop: BackgroundLoop = (
+            BackgroundLoop.shared() if loop is None else loop
+        )
+
+        async def create() -> SolarLogConnector:
+            # the client session has to be created on the loop it is used with
+            return SolarLogConnector(host, **kwargs)
+
+        self.connector: SolarLogConnector = self.background_loop.run(create())
+
+    @property
+    def host(self) -> str:
+        """Host of Solar-Log."""
+        return self.connector.host
+
+    def test_connection(self) -> bool:
+        """Test if connection to Solar-Log works."""
+        return self.background_loop.run(self.connector.test_connection())
+
+    def test_extended_data_available(self) -> bool:
+        """Test if extended data is reachable."""
+        return self.background_loop.run(self.connector.test_extended_data_available())
+
+    def login(self) -> bool:
+        """Login to Solar-Log."""
+        return self.background_loop.run(self.connector.login())
+
+    def update_data(self) -> SolarlogData:
+        """Get data from Solar-Log."""
+        return self.background_loop.run(self.connector.update_data())
+
+    def update_device_list(self) -> dict[int, InverterData]:
+        """Update list of devices."""
+        return self.background_loop.run(self.connector.update_device_list())
+
+    def update_inverter_data(self) -> dict[int, InverterData]:
+        """Update device specific data."""
+        return self.background_loop.run(self.connector.update_inverter_data())
+
+    def close(self) -> None:
+        """Close client session."""
+        self.background_loop.run(self.connector.client.close())
+
+
+def update_many(
+    connectors: Iterable[SyncSolarLogConnector], timeout: float | None = None
+) -> list[FleetResult]:
+    """Poll many Solar-Logs concurrently and return all results (in the given order)."""
+
+    connectors = list(connectors)
+    if not connectors:
+        return []
+
+    background_loop = connectors[0].background_loop
+    if any(item.background_loop is not background_loop for item in connectors):
+        raise ValueError("All connectors have to run on the same background loop.")
+
+    async def update(connector: SolarLogConnector) -> FleetResult:
+        try:
+            return FleetResult(connector.host, data=await connector.update_data())
+        except SolarLogError as err:
+            return FleetResult(connector.host, error=err)
+
+    async def update_all() -> list[FleetResult]:
+        return list(
+            await asyncio.gather(*(update(item.connector) for item in connectors))
+        )
+
+    return background_loop.run(update_all(), timeout)
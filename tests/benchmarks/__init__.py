@@ -0,0 +1 @@
+"""Benchmarks for solarlog_cli."""
@@ -0,0 +1,27 @@
+"""Benchmarks for solarlog_cli - configurations."""
+
+import asyncio
+from collections.abc import Generator
+
+import pytest
+
+from ..emulator import SolarLogEmulator
+
+
+@pytest.fixture(name="benchmark_loop")
+def benchmark_loop_fixture() -> Generator[asyncio.AbstractEventLoop, None, None]:
+    """Return event loop to run the benchmarked coroutines in."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(name="emulator")
+def emulator_fixture(
+    benchmark_loop: asyncio.AbstractEventLoop,
+) -> Generator[SolarLogEmulator, None, None]:
+    """Return running Solar-Log emulator of a plant with 40 inverters."""
+    emulator = SolarLogEmulator(inverters=40, years=10)
+    benchmark_loop.run_until_complete(emulator.start())
+    yield emulator
+    benchmark_loop.run_until_complete(emulator.stop())
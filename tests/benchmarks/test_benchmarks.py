@@ -0,0 +1,106 @@
+"""Benchmarks for solarlog_cli against the Solar-Log emulator."""
+
+import asyncio
+from dataclasses import fields, make_dataclass
+import tracemalloc
+
+import pytest
+
+from solarlog_cli.solarlog_connector import SolarLogConnector
+from solarlog_cli.solarlog_fleet import SolarLogFleet
+from solarlog_cli.solarlog_models import SolarlogData
+
+from ..emulator import SolarLogEmulator
+
+pytest.importorskip("pytest_benchmark")
+
+
+async def _create_connector(host: str) -> SolarLogConnector:
+    """Create connector with extended data and device list."""
+    connector = SolarLogConnector(host, extended_data=True, tz="UTC")
+    await connector.update_device_list()
+    connector.set_enabled_devices({key: True for key in connector.device_list})
+    return connector
+
+
+def test_update_data(
+    benchmark,
+    benchmark_loop: asyncio.AbstractEventLoop,
+    emulator: SolarLogEmulator,
+) -> None:
+    """Benchmark update data with extended data of 40 inverters."""
+    connector = benchmark_loop.run_until_complete(_create_connector(emulator.url))
+
+    data = benchmark(lambda: benchmark_loop.run_until_complete(connector.update_data()))
+
+    assert len(data.inverter_data) == 40
+    benchmark_loop.run_until_complete(connector.client.close())
+
+
+def test_update_device_list(
+    benchmark,
+    benchmark_loop: asyncio.AbstractEventLoop,
+    emulator: SolarLogEmulator,
+) -> None:
+    """Benchmark update device list of 40 inverters."""
+    connector = benchmark_loop.run_until_complete(_create_connector(emulator.url))
+
+    devices = benchmark(
+        lambda: benchmark_loop.run_until_complete(connector.update_device_list())
+    )
+
+    assert len(devices) == 40
+    benchmark_loop.run_until_complete(connector.client.close())
+
+
+def test_fleet_poll(
+    benchmark,
+    benchmark_loop: asyncio.AbstractEventLoop,
+    emulator: SolarLogEmulator,
+) -> None:
+    """Benchmark polling a fleet of 100 Solar-Logs once."""
+
+    async def create_fleet() -> SolarLogFleet:
+        fleet = SolarLogFleet()
+        for site in range(100):
+            fleet.add_host(f"{emulator.url}/site{site}", tz="UTC")
+        return fleet
+
+    async def poll_once() -> int:
+        return len([result async for result in fleet.poll_once() if result.error is None])
+
+    fleet = benchmark_loop.run_until_complete(create_fleet())
+
+    assert benchmark(lambda: benchmark_loop.run_until_complete(poll_once())) == 100
+    benchmark_loop.run_until_complete(fleet.close())
+
+
+def test_data_memory(
+    benchmark,
+    benchmark_loop: asyncio.AbstractEventLoop,
+    emulator: SolarLogEmulator,
+) -> None:
+    """Benchmark memory per instance of slotted data compared to a plain dataclass."""
+    connector = benchmark_loop.run_until_complete(_create_connector(emulator.url))
+    data = benchmark_loop.run_until_complete(connector.update_data())
+    benchmark_loop.run_until_complete(connector.client.close())
+
+    plain_data = make_dataclass(
+        "PlainSolarlogData", [(item.name, item.type) for item in fields(SolarlogData)]
+    )
+    values = {item.name: getattr(data, item.name) for item in fields(data)}
+
+    def allocated(factory) -> float:
+        tracemalloc.start()
+        instances = [factory(**values) for _ in range(10000)]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del instances
+        return size / 10000
+
+    size = benchmark(lambda: allocated(SolarlogData))
+    plain_size = allocated(plain_data)
+    benchmark.extra_info["bytes_per_instance"] = size
+    benchmark.extra_info["plain_bytes_per_instance"] = plain_size
+
+    assert size < plain_size
@@ -0,0 +1,72 @@
+"""Benchmarks for solarlog_cli - import time."""
+
+import ast
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+import solarlog_cli
+
+HEAVY_MODULES = {"aiohttp", "mashumaro", "zoneinfo"}
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """Import module in a new interpreter, return cumulative import time (in us) per module."""
+    env = os.environ | {"PYTHONPATH": str(Path(solarlog_cli.__file__).parents[1])}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    )
+
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+
+    return times
+
+
+@pytest.mark.parametrize("module", ["solarlog_cli", "solarlog_cli.__main__"])
+def test_import_without_heavy_modules(module: str) -> None:
+    """Test the package and the command line interface load no heavy modules on import."""
+    times = _import_times(module)
+
+    assert module in times
+    assert not HEAVY_MODULES & set(times)
+
+
+def test_connector_import() -> None:
+    """Test the connector loads aiohttp only when it is used."""
+    times = _import_times("solarlog_cli.solarlog_connector")
+
+    assert "aiohttp" not in times
+    # about 100 ms, more than 200 ms if aiohttp is imported
+    assert times["solarlog_cli.solarlog_connector"] < 200_000
+
+
+def test_lazy_exports() -> None:
+    """Test the public names are imported on first access."""
+    tree = ast.parse(Path(solarlog_cli.__file__).read_text(encoding="utf-8"))
+    reexported = {
+        alias.asname
+        for node in ast.walk(tree)
+        if isinstance(node, ast.ImportFrom)
+        for alias in node.names
+        if alias.asname is not None
+    }
+    assert reexported == set(solarlog_cli.__all__)
+
+    for name in solarlog_cli.__all__:
+        assert getattr(solarlog_cli, name) is not None
+    assert "SolarLogConnector" in dir(solarlog_cli)
+    assert solarlog_cli.SolarLogConnector.__module__ == "solarlog_cli.solarlog_connector"
+    with pytest.raises(AttributeError):
+        _ = solarlog_cli.Unknown
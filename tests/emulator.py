@@ -0,0 +1,182 @@
+"""Solar-Log emulator for tests and benchmarks of solarlog_cli."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+from aiohttp import web
+
+from . import load_fixture
+
+
+class SolarLogEmulator:
+    """Local Solar-Log serving /getjp and /login.
+
+    The payloads are based on the fixtures, the number of inverters and years of
+    history can be configured to emulate larger plants. Every request is delayed
+    by latency seconds. Hosts with a path prefix (e.g. http://127.0.0.1:1234/site1)
+    are served by the same emulator, so one emulator can stand in for a fleet.
+    """
+
+    # pylint: disable=too-many-arguments
+    # pylint: disable=too-many-instance-attributes
+    # pylint: disable=too-many-positional-arguments
+
+    def __init__(
+        self,
+        inverters: int = 4,
+        years: int = 5,
+        latency: float = 0,
+        password: str = "",
+        host: str = "127.0.0.1",
+    ) -> None:
+        self.latency: float = latency
+        self.password: str = password
+        self.token: str = "token"
+        self.requests: int = 0
+        self.logins: int = 0
+
+        self._host: str = host
+        self._port: int = 0
+        self._runner: web.AppRunner | None = None
+
+        self.app = web.Application()
+        self.app.router.add_post("/getjp", self._handle_getjp)
+        self.app.router.add_post("/login", self._handle_login)
+        self.app.router.add_post("/{site}/getjp", self._handle_getjp)
+        self.app.router.add_post("/{site}/login", self._handle_login)
+
+        self.data: dict[str, Any] = self.create_data(inverters, years)
+
+    @staticmethod
+    def create_data(inverters: int, years: int) -> dict[str, Any]:
+        """Create data objects for a plant with the given number of inverters and years."""
+
+        data: dict[str, Any] = json.loads(load_fixture("basic_data.json"))
+        energy: list[list[Any]] = json.loads(load_fixture("extended_data.json"))["878"]
+        power: list[int] = [
+            int(value)
+            for value in json.loads(load_fixture("power_per_inverter.json"))["782"].values()
+        ]
+        energy_per_inverter: list[int] = json.loads(
+            load_fixture("energy_per_inverter.json")
+        )["854"][-1][-1]
+
+        data["740"] = {str(i): f"{i} / 191125{i:02}" for i in range(inverters)}
+        data["141"] = {str(i): {"119": f"Device {i + 1}"} for i in range(inverters)}
+        data["782"] = {str(i): str(power[i % len(power)]) for i in range(inverters)}
+        data["854"] = [
+            [
+                f"01.01.{year % 100:02}",
+                [energy_per_inverter[i % len(energy_per_inverter)] for i in range(inverters)],
+            ]
+            for year in range(2024 - years + 1, 2025)
+        ]
+        yearly_energy = [
+            energy_per_inverter[i % len(energy_per_inverter)] for i in range(inverters)
+        ]
+        data["777"] = [
+            [f"{day:02}.08.24", [value // 365 for value in yearly_energy]]
+            for day in range(1, 32)
+        ]
+        data["779"] = [
+            [f"01.{month:02}.24", [value // 12 for value in yearly_energy]]
+            for month in range(1, 13)
+        ]
+        data["877"] = [
+            [f"01.{month:02}.24", *(value // 12 for value in energy[-1][1:])]
+            for month in range(1, 13)
+        ]
+        data["878"] = [
+            [f"01.01.{year % 100:02}", *energy[-1][1:]]
+            for year in range(2024 - years + 1, 2025)
+        ]
+
+        return data
+
+    @classmethod
+    def select(cls, query: dict[str, Any], data: dict[str, Any]) -> dict[str, Any]:
+        """Select the requested data objects like Solar-Log does."""
+
+        response: dict[str, Any] = {}
+        for key, value in query.items():
+            if key not in data:
+                response[key] = "QUERY IMPOSSIBLE 000"
+            elif isinstance(value, dict) and isinstance(data[key], dict):
+                response[key] = cls.select(value, data[key])
+            else:
+                response[key] = data[key]
+
+        return response
+
+    async def _handle_getjp(self, request: web.Request) -> web.Response:
+        """Handle data requests."""
+
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        body = await request.text()
+        token = ""
+        if body.startswith("token="):
+            token, _, body = body.partition("; ")
+            token = token.removeprefix("token=")
+
+        try:
+            query = json.loads(body)
+        except ValueError:
+            query = None
+        if not isinstance(query, dict):
+            return web.Response(text='{"QUERY IMPOSSIBLE 000"}', content_type="text/html")
+
+        response = self.select(query, self.data)
+
+        if self.password and token != self.token:
+            response = {
+                key: value if key == "801" else "ACCESS DENIED"
+                for key, value in response.items()
+            }
+
+        return web.Response(text=json.dumps(response), content_type="text/html")
+
+    async def _handle_login(self, request: web.Request) -> web.Response:
+        """Handle login requests."""
+
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        body = await request.text()
+
+        if not self.password:
+            return web.Response(text="FAILED - User was wrong")
+        if body != f"u=user&p={self.password}":
+            return web.Response(text="FAILED - Password was wrong")
+
+        self.logins += 1
+        response = web.Response(text="SUCCESS - Password was correct, you are now logged in")
+        response.set_cookie("SolarLog", self.token)
+        return response
+
+    @property
+    def url(self) -> str:
+        """URL of the emulator (to be used as host)."""
+        return f"http://{self._host}:{self._port}"
+
+    async def start(self) -> None:
+        """Start the emulator on a free port."""
+
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self._host, 0)
+        await site.start()
+        self._port = self._runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        """Stop the emulator."""
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
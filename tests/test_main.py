@@ -0,0 +1,45 @@
+"""Tests for solarlog_cli - command line interface."""
+
+from io import StringIO
+import json
+
+from solarlog_cli.__main__ import COMMANDS, _parser
+
+from .emulator import SolarLogEmulator
+
+
+async def _run(argv: list[str]) -> tuple[int, list[dict]]:
+    """Run command and return exit code and output lines."""
+    args = _parser().parse_args(argv)
+    output = StringIO()
+    exit_code = await COMMANDS[args.command](args, output)
+    return exit_code, [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+async def test_commands() -> None:
+    """Test get, devices and watch commands."""
+    emulator = SolarLogEmulator(password="pwd")
+    await emulator.start()
+
+    exit_code, lines = await _run(["get", "-e", "-p", "pwd", "--tz", "UTC", emulator.url])
+    assert exit_code == 0
+    assert lines[0]["host"] == emulator.url
+    assert lines[0]["data"]["last_updated"] == "2024-08-26T14:19:45+00:00"
+    assert lines[0]["data"]["inverter_data"]["3"]["current_power"] == 2816.0
+
+    exit_code, lines = await _run(
+        ["devices", "-p", "pwd", emulator.url, f"{emulator.url}/site1"]
+    )
+    assert exit_code == 0
+    assert len(lines) == 2
+    assert lines[0]["devices"]["0"] == "Device 1"
+
+    exit_code, lines = await _run(["devices", emulator.url])
+    assert exit_code == 1
+    assert "error" in lines[0]
+
+    exit_code, lines = await _run(["watch", "-i", "0", "-n", "3", emulator.url])
+    assert exit_code == 0
+    assert len(lines) == 3
+
+    await emulator.stop()
@@ -0,0 +1,47 @@
+"""Tests for solarlog_cli - backfill."""
+
+from datetime import datetime
+from pathlib import Path
+
+from solarlog_cli.solarlog_backfill import SolarLogBackfill
+from solarlog_cli.solarlog_client import MONTHLY_ENERGY_HISTORY, Client
+
+from .emulator import SolarLogEmulator
+
+
+async def test_backfill(tmp_path: Path) -> None:
+    """Test backfill resuming from the checkpoint."""
+    emulator = SolarLogEmulator()
+    await emulator.start()
+    client = Client(emulator.url, None)
+    database = str(tmp_path / "backfill.db")
+
+    backfill = SolarLogBackfill(database, commit_interval=3)
+    assert backfill.checkpoint(client.host) is None
+
+    # interrupted after processing 10 days
+    rows = backfill.backfill(client)
+    async for row in rows:
+        if row.date.day == 11:
+            break
+    await rows.aclose()
+    backfill.close()
+
+    backfill = SolarLogBackfill(database)
+    assert backfill.checkpoint(client.host) == datetime(2024, 8, 10)
+
+    dates = [row.date.day async for row in backfill.backfill(client)]
+    assert dates == list(range(11, 32))
+    assert backfill.checkpoint(client.host) == datetime(2024, 8, 30)
+
+    # latest day may still change
+    assert [row.date.day async for row in backfill.backfill(client)] == [31]
+
+    months = [row async for row in backfill.backfill(client, MONTHLY_ENERGY_HISTORY)]
+    assert len(months) == 12
+    backfill.reset(client.host)
+    assert backfill.checkpoint(client.host, MONTHLY_ENERGY_HISTORY) is None
+
+    backfill.close()
+    await client.close()
+    await emulator.stop()
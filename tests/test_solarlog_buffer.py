@@ -0,0 +1,68 @@
+"""Tests for solarlog_cli - columnar buffer."""
+
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+import json
+
+import pytest
+
+from solarlog_cli import solarlog_buffer
+from solarlog_cli.solarlog_buffer import SolarLogBuffer
+from solarlog_cli.solarlog_client import parse_basic_data
+from solarlog_cli.solarlog_models import SolarlogData
+
+from . import load_fixture
+
+DATA = parse_basic_data(json.loads(load_fixture("basic_data.json")))
+START = datetime(2024, 8, 26, 14, 0, tzinfo=timezone.utc)
+
+
+def _data(minutes: int, power_ac: float) -> SolarlogData:
+    """Return data last updated minutes after START."""
+    return replace(DATA, last_updated=START + timedelta(minutes=minutes), power_ac=power_ac)
+
+
+@pytest.fixture(name="numpy", params=[True, False])
+def numpy_fixture(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> bool:
+    """Run tests with and without NumPy."""
+    if request.param:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(solarlog_buffer, "np", None)
+    return request.param
+
+
+@pytest.mark.usefixtures("numpy")
+def test_append() -> None:
+    """Test appending data to the ring buffer."""
+    buffer = SolarLogBuffer(capacity=3, columns=("power_ac", "efficiency"))
+    assert buffer.last_updated is None
+    assert buffer.mean("power_ac", 600) is None
+
+    assert buffer.append(_data(0, 100))
+    assert not buffer.append(_data(0, 200))
+    assert len(buffer) == 1
+
+    for minute in range(1, 4):
+        buffer.append(_data(minute, 100 * (minute + 1)))
+
+    assert len(buffer) == 3
+    assert list(buffer.column("power_ac")) == [200, 300, 400]
+    assert buffer.last_updated == (START + timedelta(minutes=3)).timestamp()
+    assert buffer.max("efficiency", 600) is None
+
+
+@pytest.mark.usefixtures("numpy")
+def test_window_queries() -> None:
+    """Test aggregating values over windows."""
+    buffer = SolarLogBuffer()
+    for minute, power in enumerate((0, 600, 1200, 1200, 600)):
+        buffer.append(_data(minute, power))
+
+    assert buffer.mean("power_ac", 120) == 1000
+    assert buffer.max("power_ac", 120) == 1200
+    assert buffer.max("power_ac", 60, end=START.timestamp() + 60) == 600
+
+    # 60 s at 300 W, 900 W, 1200 W and 900 W
+    assert buffer.integrate("power_ac", 3600) == pytest.approx(55)
+    assert buffer.integrate("power_ac", 0) == 0
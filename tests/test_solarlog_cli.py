@@ -1,20 +1,52 @@
 """Tests for solarlog_cli."""
 
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import fields
+from datetime import datetime, timezone
+import json
+from typing import Any
+from unittest.mock import patch
+
 from aioresponses import aioresponses
-from aiohttp import ClientSession
+from aiohttp import ClientConnectionError, ClientSession
+from yarl import URL
 
 import pytest
 from syrupy.assertion import SnapshotAssertion
 
+from solarlog_cli.solarlog_cache import SolarLogCache
+from solarlog_cli.solarlog_client import (
+    DAILY_ENERGY_PER_INVERTER_HISTORY,
+    ClientConfig,
+    DEFAULT_JSON_DECODER,
+    MONTHLY_ENERGY_HISTORY,
+    JsonDecoder,
+    iter_history_rows,
+    parse_basic_data,
+    parse_power_per_inverter,
+)
 from solarlog_cli.solarlog_connector import SolarLogConnector
 from solarlog_cli.solarlog_exceptions import (
     SolarLogAuthenticationError,
+    SolarLogCircuitOpenError,
     SolarLogConnectionError,
     SolarLogError,
     SolarLogUpdateError,
 )
+from solarlog_cli.solarlog_models import (
+    InverterData,
+    InverterSnapshot,
+    RequestMetrics,
+    SolarlogData,
+    SolarlogSnapshot,
+    diff,
+)
+
+from solarlog_cli.solarlog_retry import CircuitBreaker, RetryPolicy
 
 from . import load_fixture
+from .emulator import SolarLogEmulator
 
 
 @pytest.mark.parametrize(
@@ -69,6 +101,44 @@ async def test_existing_session(
     await solarlog_connector.client.close()
     assert solarlog_connector.client.session.closed
 
+async def test_client_config(responses: aioresponses) -> None:
+    """Test timeouts and connection settings of the client."""
+    responses.post(
+        "http://solarlog.com/getjp",
+        body=load_fixture("basic_data.json"),
+    )
+
+    config = ClientConfig(request_timeout=5, limit_per_host=1)
+    solarlog_connector = SolarLogConnector("http://solarlog.com", client_config=config)
+    client = solarlog_connector.client
+
+    connector = client.session.connector
+    assert connector is not None
+    assert connector.limit_per_host == 1
+    assert client.session.timeout.total == 5
+
+    client.request_timeout = 10
+    assert client.config.request_timeout == 10
+    assert config.request_timeout == 5
+
+    responses.post(
+        "http://solarlog.com/getjp",
+        body=load_fixture("basic_data.json"),
+    )
+    with patch.object(
+        ClientConfig, "timeout", autospec=True, side_effect=ClientConfig.timeout
+    ) as timeout:
+        await solarlog_connector.update_data()
+        await solarlog_connector.update_data()
+    # built once when changed, not per request
+    timeout.assert_not_called()
+    requests = responses.requests[("POST", URL("http://solarlog.com/getjp"))]
+    assert requests[0].kwargs["timeout"].total == 10
+    assert requests[1].kwargs["timeout"].total == 10
+
+    await client.close()
+
+
 async def test_extended_data_available(
     responses: aioresponses,
 ) -> None:
@@ -129,6 +199,121 @@ async def test_login_and_data_retreival(responses: aioresponses) -> None:
     await solarlog_connector.client.close()
     assert solarlog_connector.client.session.closed
 
+async def test_relogin() -> None:
+    """Test logging in again once for concurrent requests after the token expired."""
+    emulator = SolarLogEmulator(password="pwd")
+    await emulator.start()
+
+    solarlog_connector = SolarLogConnector(emulator.url, True, password="pwd")
+    solarlog_connector.client.token = "expired"
+
+    results = await asyncio.gather(
+        *(solarlog_connector.client.get_device_list() for _ in range(5))
+    )
+
+    assert results[0] == {0: "Device 1", 1: "Device 2", 2: "Device 3", 3: "Device 4"}
+    assert all(result == results[0] for result in results)
+    assert solarlog_connector.client.token == "token"
+    assert emulator.logins == 1
+
+    solarlog_connector.client.password = "wrong"
+    solarlog_connector.client.token = "expired"
+    with pytest.raises(SolarLogAuthenticationError):
+        await solarlog_connector.client.get_device_list()
+
+    await solarlog_connector.client.close()
+    await emulator.stop()
+
+
+async def test_connection_pool() -> None:
+    """Test connections are released to the pool under sustained polling."""
+    # the pool is only accessible through protected members of the connector
+    # pylint: disable=protected-access
+    emulator = SolarLogEmulator()
+    await emulator.start()
+
+    solarlog_connector = SolarLogConnector(emulator.url, True, "UTC")
+    client = solarlog_connector.client
+    connector = client.session.connector
+    assert connector is not None
+
+    for _ in range(20):
+        assert await solarlog_connector.test_connection()
+        await solarlog_connector.update_data()
+        with pytest.raises(SolarLogUpdateError):
+            await client.execute_http_request("invalid", "unknown")
+        with pytest.raises(SolarLogUpdateError):
+            await client.parse_http_response(await client.execute_http_request("invalid"))
+        assert not connector._acquired
+
+    assert sum(len(conns) for conns in connector._conns.values()) <= 2
+
+    await client.close()
+    await emulator.stop()
+
+
+async def test_iter_history() -> None:
+    """Test streaming history data objects row by row."""
+    emulator = SolarLogEmulator(password="pwd")
+    await emulator.start()
+
+    solarlog_connector = SolarLogConnector(emulator.url, True, "UTC", password="pwd")
+    solarlog_connector.client.token = "expired"
+
+    rows = [
+        row
+        async for row in solarlog_connector.iter_history(DAILY_ENERGY_PER_INVERTER_HISTORY)
+    ]
+
+    assert len(rows) == 31
+    assert rows[0].date == datetime(2024, 8, 1, tzinfo=timezone.utc)
+    assert len(rows[0].values) == 4
+    assert emulator.logins == 1
+
+    months = solarlog_connector.client.iter_history(MONTHLY_ENERGY_HISTORY)
+    row = await anext(months)
+    assert row.values[0] == emulator.data["877"][0][1]
+    await months.aclose()
+
+    await solarlog_connector.client.close()
+    await emulator.stop()
+
+
+async def _chunks(body: bytes, size: int) -> AsyncIterator[bytes]:
+    """Return body in chunks of size."""
+    for i in range(0, len(body), size):
+        yield body[i:i + size]
+
+
+@pytest.mark.parametrize("size", [1, 7, 1000])
+async def test_iter_history_rows(size: int) -> None:
+    """Test parsing rows of history data objects incrementally."""
+    body = load_fixture("energy_per_inverter.json").encode()
+
+    rows = [row async for row in iter_history_rows(_chunks(body, size), "854")]
+
+    assert rows == json.loads(body)["854"]
+
+
+@pytest.mark.parametrize(
+    ("body", "exception"),
+    [
+        (b'{"QUERY IMPOSSIBLE 000"}', SolarLogUpdateError),
+        (b'{"854":"QUERY IMPOSSIBLE 000"}', SolarLogUpdateError),
+        (b'{"854":"ACCESS DENIED"}', SolarLogAuthenticationError),
+        (b'{"854":[["01.01.24",[1, 2', SolarLogUpdateError),
+        (b'<html></html>', SolarLogUpdateError),
+    ],
+)
+async def test_iter_history_rows_exceptions(
+    body: bytes, exception: type[SolarLogError]
+) -> None:
+    """Test exceptions while parsing rows of history data objects."""
+    with pytest.raises(exception):
+        async for _ in iter_history_rows(_chunks(body, 4), "854"):
+            pass
+
+
 async def test_login_exceptions(responses: aioresponses) -> None:
     """Test exceptions at login into Solar-Log."""
     solarlog_connector = SolarLogConnector("http://solarlog.com", password="pwd")
@@ -162,19 +347,30 @@ async def test_update_data(
     """Test update data."""
     responses.post(
         "http://solarlog.com/getjp",
-        body=load_fixture("basic_data.json"),
-    )
-    responses.post(
-        "http://solarlog.com/getjp",
-        body=load_fixture("extended_data.json"),
+        body=load_fixture("update_data.json"),
     )
-    responses.post(
-        "http://solarlog.com/getjp",
-        body=load_fixture("power_per_inverter.json"),
+
+    solarlog_connector = SolarLogConnector(
+        "http://solarlog.com",
+        True,
+        "UTC",
+        {0: True, 1: True, 2: False, 3: True},
     )
+
+    data = await solarlog_connector.update_data()
+
+    assert data == snapshot
+
+    await solarlog_connector.client.close()
+    assert solarlog_connector.client.session.closed
+
+
+async def test_update_data_cached(responses: aioresponses) -> None:
+    """Test update data with cached data objects."""
     responses.post(
         "http://solarlog.com/getjp",
-        body=load_fixture("energy_per_inverter.json"),
+        body=load_fixture("update_data.json"),
+        repeat=True,
     )
 
     solarlog_connector = SolarLogConnector(
@@ -183,10 +379,218 @@ async def test_update_data(
         "UTC",
         {0: True, 1: True, 2: False, 3: True},
     )
+    solarlog_connector.client.cache = SolarLogCache()
 
     data = await solarlog_connector.update_data()
+    cached_data = await solarlog_connector.update_data()
 
-    assert data == snapshot
+    assert cached_data.production_year == data.production_year
+    assert cached_data.inverter_data[1].consumption_year == 1920650
+
+    requests = responses.requests[("POST", URL("http://solarlog.com/getjp"))]
+    assert requests[0].kwargs["data"] == (
+        '{"801": {"170": null}, "878": null, "782": null, "854": null}'
+    )
+    assert requests[1].kwargs["data"] == '{"801": {"170": null}, "782": null}'
+
+    solarlog_connector.client.cache.invalidate("878")
+    await solarlog_connector.update_data()
+    assert requests[2].kwargs["data"] == '{"801": {"170": null}, "878": null, "782": null}'
+
+    solarlog_connector.client.cache.invalidate()
+    await solarlog_connector.update_data()
+    assert requests[3].kwargs["data"] == requests[0].kwargs["data"]
+
+    await solarlog_connector.client.close()
+    assert solarlog_connector.client.session.closed
+
+
+async def test_update_data_delta(responses: aioresponses) -> None:
+    """Test update data returning changed fields only."""
+    responses.post(
+        "http://solarlog.com/getjp",
+        body=load_fixture("basic_data.json"),
+    )
+    responses.post(
+        "http://solarlog.com/getjp",
+        body=load_fixture("basic_data_no_power.json"),
+    )
+    responses.post(
+        "http://solarlog.com/getjp",
+        body=load_fixture("basic_data_no_power.json").replace("14:19:45", "14:20:45"),
+    )
+
+    solarlog_connector = SolarLogConnector("http://solarlog.com")
+
+    delta = await solarlog_connector.update_data_delta()
+    assert delta["power_ac"] == 2891
+    assert delta["yield_total"] is not None
+
+    # last_updated unchanged
+    assert await solarlog_connector.update_data_delta() == {}
+
+    delta = await solarlog_connector.update_data_delta()
+    assert set(delta) == {
+        "last_updated",
+        "power_ac",
+        "power_dc",
+        "alternator_loss",
+        "efficiency",
+        "usage",
+        "power_available",
+        "capacity",
+    }
+    assert delta["power_dc"] == 0
+
+    await solarlog_connector.client.close()
+
+
+def test_diff() -> None:
+    """Test diff of inverter data."""
+    previous = parse_basic_data(json.loads(load_fixture("basic_data.json")))
+    previous.inverter_data = {0: InverterData("Inverter 1", True, 100, 1000)}
+    current = parse_basic_data(json.loads(load_fixture("basic_data.json")))
+    current.inverter_data = {
+        0: InverterData("Inverter 1", True, 200, 1000),
+        1: InverterData("Inverter 2"),
+    }
+
+    assert diff(previous, current) == {
+        "inverter_data": {
+            0: {"current_power": 200},
+            1: {
+                "name": "Inverter 2",
+                "enabled": False,
+                "current_power": None,
+                "consumption_year": None,
+            },
+        },
+    }
+
+
+def test_snapshot() -> None:
+    """Test immutable snapshot of data."""
+    data = parse_basic_data(json.loads(load_fixture("basic_data.json")))
+    data.inverter_data = {1: InverterData("Inverter 2"), 0: InverterData("Inverter 1")}
+
+    snapshot = data.snapshot()
+
+    assert not hasattr(data, "__dict__")
+    assert snapshot.power_ac == data.power_ac
+    assert snapshot.inverter_data == (
+        (0, InverterSnapshot("Inverter 1")),
+        (1, InverterSnapshot("Inverter 2")),
+    )
+    assert hash(snapshot) == hash(data.snapshot())
+    assert snapshot.to_dict()["last_updated"] == data.to_dict()["last_updated"]
+    with pytest.raises(AttributeError):
+        snapshot.power_ac = 0  # type: ignore[misc]
+
+
+@pytest.mark.parametrize(
+    ("data_class", "snapshot_class"),
+    [(SolarlogData, SolarlogSnapshot), (InverterData, InverterSnapshot)],
+)
+def test_snapshot_fields(data_class: type, snapshot_class: type) -> None:
+    """Test snapshots have the fields of the data (in the same order)."""
+
+    def signature(cls: type) -> list[tuple[str, Any, Any]]:
+        return [
+            (item.name, item.type, item.default)
+            for item in fields(cls)
+            if item.name != "inverter_data"
+        ]
+
+    assert signature(snapshot_class) == signature(data_class)
+
+
+async def test_observer(responses: aioresponses) -> None:
+    """Test reporting metrics of requests to observers."""
+    responses.post(
+        "http://solarlog.com/getjp",
+        body=load_fixture("update_data.json"),
+    )
+    responses.post(
+        "http://solarlog.com/getjp",
+        status=400,
+    )
+
+    solarlog_connector = SolarLogConnector("http://solarlog.com", True)
+    metrics: list[RequestMetrics] = []
+    remove_observer = solarlog_connector.client.add_observer(metrics.append)
+
+    await solarlog_connector.update_data()
+    with pytest.raises(SolarLogUpdateError):
+        await solarlog_connector.update_data()
+
+    assert metrics[0].host == "http://solarlog.com"
+    assert metrics[0].objects == ("801", "878")
+    assert metrics[0].size == len(load_fixture("update_data.json").encode())
+    assert metrics[0].error is None
+    assert metrics[1].error is SolarLogUpdateError
+
+    remove_observer()
+    responses.post(
+        "http://solarlog.com/getjp",
+        body=load_fixture("update_data.json"),
+    )
+    await solarlog_connector.update_data()
+    assert len(metrics) == 2
+
+    await solarlog_connector.client.close()
+    assert solarlog_connector.client.session.closed
+
+
+async def test_query(responses: aioresponses) -> None:
+    """Test combining several data object requests into one request."""
+    responses.post(
+        "http://solarlog.com/getjp",
+        body=load_fixture("update_data.json"),
+    )
+
+    solarlog_connector = SolarLogConnector("http://solarlog.com")
+
+    query = (
+        solarlog_connector.client.query()
+        .add({"801": {"170": None}}, parse_basic_data)
+        .add({"782": None}, parse_power_per_inverter)
+        .add({"854": None})
+        .add({"801": None})
+    )
+    assert query.payload == {"801": None, "782": None, "854": None}
+
+    basic_data, power, energy, raw_data = await query.execute()
+
+    assert basic_data.power_ac == 2891
+    assert power == {0: "3170", 3: "2816"}
+    assert list(energy) == ["854"]
+    assert list(raw_data) == ["801"]
+    assert len(responses.requests) == 1
+
+    await solarlog_connector.client.close()
+    assert solarlog_connector.client.session.closed
+
+
+async def test_energy_per_inverter(responses: aioresponses) -> None:
+    """Test energy per inverter with equal values and all years."""
+    responses.post(
+        "http://solarlog.com/getjp",
+        body='{"854": [["01.01.23",[500,0]],["01.01.24",[700,700,0]]]}',
+        repeat=True,
+    )
+
+    solarlog_connector = SolarLogConnector("http://solarlog.com")
+
+    assert await solarlog_connector.client.get_energy_per_inverter() == {0: 700, 1: 700}
+
+    history = await solarlog_connector.client.get_energy_history_per_inverter()
+
+    assert [date.year for date in history.dates] == [2023, 2024]
+    assert {key: list(value) for key, value in history.energy.items()} == {
+        0: [500, 700],
+        1: [0, 700],
+        2: [0, 0],
+    }
 
     await solarlog_connector.client.close()
     assert solarlog_connector.client.session.closed
@@ -228,6 +632,79 @@ async def test_update_data_exceptions(
     assert solarlog_connector.client.session.closed
 
 
+async def test_retry(responses: aioresponses) -> None:
+    """Test retry of requests failing with connection errors."""
+    responses.post("http://solarlog.com/getjp", exception=ClientConnectionError())
+    responses.post("http://solarlog.com/getjp", exception=asyncio.TimeoutError())
+    responses.post("http://solarlog.com/getjp", body=load_fixture("basic_data.json"))
+
+    solarlog_connector = SolarLogConnector("http://solarlog.com")
+    solarlog_connector.client.retry_policy = RetryPolicy(retries=2, base_delay=0)
+
+    data = await solarlog_connector.update_data()
+    assert data.power_ac == 2891
+
+    responses.post(
+        "http://solarlog.com/getjp", exception=ClientConnectionError(), repeat=True
+    )
+    with pytest.raises(SolarLogConnectionError):
+        await solarlog_connector.update_data()
+
+    await solarlog_connector.client.close()
+
+
+async def test_circuit_breaker(responses: aioresponses) -> None:
+    """Test refusing requests to a Solar-Log failing repeatedly."""
+    for _ in range(2):
+        responses.post("http://solarlog.com/getjp", exception=ClientConnectionError())
+    responses.post("http://solarlog.com/getjp", body=load_fixture("basic_data.json"))
+
+    solarlog_connector = SolarLogConnector("http://solarlog.com")
+    breaker = solarlog_connector.client.circuit_breaker = CircuitBreaker(
+        failure_threshold=2, recovery_time=0
+    )
+
+    for _ in range(2):
+        with pytest.raises(SolarLogConnectionError):
+            await solarlog_connector.update_data()
+    assert breaker.is_open
+
+    # probe succeeds
+    await solarlog_connector.update_data()
+    assert not breaker.is_open
+
+    breaker = solarlog_connector.client.circuit_breaker = CircuitBreaker(
+        failure_threshold=1
+    )
+    breaker.record_failure()
+    with pytest.raises(SolarLogCircuitOpenError):
+        await solarlog_connector.update_data()
+
+    await solarlog_connector.client.close()
+
+
+def test_circuit_breaker_probes() -> None:
+    """Test probing an open circuit at a reduced rate."""
+    breaker = CircuitBreaker(failure_threshold=1, recovery_time=10, max_recovery_time=15)
+
+    with patch("solarlog_cli.solarlog_retry.time.monotonic", return_value=0):
+        breaker.record_failure()
+        assert not breaker.allow()
+
+    with patch("solarlog_cli.solarlog_retry.time.monotonic", return_value=10):
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_failure()
+
+    with patch("solarlog_cli.solarlog_retry.time.monotonic", return_value=20):
+        assert not breaker.allow()
+
+    with patch("solarlog_cli.solarlog_retry.time.monotonic", return_value=25):
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.allow()
+
+
 async def test_update_data_with_data_exceptions(
     responses: aioresponses,
 ) -> None:
@@ -244,12 +721,17 @@ async def test_update_data_with_data_exceptions(
         "http://solarlog.com/getjp",
         body=load_fixture("basic_data_during_update.json"),
     )
+    responses.post(
+        "http://solarlog.com/getjp",
+        body=load_fixture("basic_data.json").rstrip().removesuffix("}")
+        + ', "878": "ACCESS DENIED"}',
+    )
     responses.post(
         "http://solarlog.com/getjp",
         body=load_fixture("basic_data_no_power.json"),
     )
 
-    solarlog_connector = SolarLogConnector("http://solarlog.com")
+    solarlog_connector = SolarLogConnector("http://solarlog.com", extended_data=True)
 
     with pytest.raises(SolarLogUpdateError):
         await solarlog_connector.update_data()
@@ -260,6 +742,11 @@ async def test_update_data_with_data_exceptions(
     with pytest.raises(SolarLogUpdateError):
         await solarlog_connector.update_data()
 
+    # access to energy denied behind the basic data of a combined query
+    with pytest.raises(SolarLogAuthenticationError):
+        await solarlog_connector.update_data()
+    solarlog_connector.extended_data = False
+
     data = await solarlog_connector.update_data()
 
     assert data.usage == 0
@@ -269,12 +756,86 @@ async def test_update_data_with_data_exceptions(
     assert solarlog_connector.client.session.closed
 
 
+@pytest.mark.parametrize("json_decoder", [json.loads, DEFAULT_JSON_DECODER])
+async def test_parse_http_response(
+    responses: aioresponses,
+    json_decoder: JsonDecoder,
+) -> None:
+    """Test parsing of responses with different decoders and charsets."""
+    responses.post(
+        "http://solarlog.com/getjp",
+        body='{"141": {"0": {"119": "Süd"}}}'.encode("latin-1"),
+        content_type="text/html; charset=iso-8859-1",
+    )
+    responses.post(
+        "http://solarlog.com/getjp",
+        body=load_fixture("update_data.json"),
+    )
+    responses.post(
+        "http://solarlog.com/getjp",
+        # name of the last of many inverters denied
+        body=json.dumps(
+            {"141": {str(i): {"119": f"Inverter {i}" * 4} for i in range(9)}}
+        ).removesuffix("}}") + ', "9": {"119": "ACCESS DENIED"}}}',
+    )
+
+    solarlog_connector = SolarLogConnector("http://solarlog.com")
+    solarlog_connector.client.json_decoder = json_decoder
+
+    raw_data = await solarlog_connector.client.get_objects({"141": {"0": {"119": None}}})
+    assert raw_data == {"141": {"0": {"119": "Süd"}}}
+
+    raw_data = await solarlog_connector.client.get_objects({"801": None})
+    assert raw_data["854"][-1][-1] == [4227027, 1920650, 0, 0]
+
+    with pytest.raises(SolarLogAuthenticationError):
+        await solarlog_connector.client.get_objects({"141": {"0": {"119": None}}})
+
+    await solarlog_connector.client.close()
+    assert solarlog_connector.client.session.closed
+
+
 async def test_update_device_list(
     responses: aioresponses,
     snapshot: SnapshotAssertion
 ) -> None:
     """Test update device list."""
 
+    responses.post(
+        "http://solarlog.com/getjp",
+        body=load_fixture("device_list.json"),
+    )
+    responses.post(
+        "http://solarlog.com/getjp",
+        body=load_fixture("device_names.json"),
+    )
+
+    solarlog_connector = SolarLogConnector(
+        "http://solarlog.com",
+        True,
+        "UTC",
+        {0: True, 1: False, 2: False, 3: True},
+    )
+
+    await solarlog_connector.update_device_list()
+    data = solarlog_connector.device_list
+
+    assert data == snapshot
+    assert len(responses.requests[("POST", URL("http://solarlog.com/getjp"))]) == 2
+
+    assert solarlog_connector.device_name(0) == "Device 1"
+    assert solarlog_connector.device_name(4) == ""
+
+    await solarlog_connector.client.close()
+    assert solarlog_connector.client.session.closed
+
+
+async def test_update_device_list_chunked(
+    responses: aioresponses,
+    snapshot: SnapshotAssertion
+) -> None:
+    """Test update device list with one request per device name."""
+
     responses.post(
         "http://solarlog.com/getjp",
         body=load_fixture("device_list.json"),
@@ -302,15 +863,14 @@ async def test_update_device_list(
         "UTC",
         {0: True, 1: False, 2: False, 3: True},
     )
+    solarlog_connector.client.device_names_per_request = 1
+    solarlog_connector.client.max_concurrent_requests = 1
 
     await solarlog_connector.update_device_list()
     data = solarlog_connector.device_list
 
     assert data == snapshot
 
-    assert solarlog_connector.device_name(0) == "Device 1"
-    assert solarlog_connector.device_name(4) == ""
-
     await solarlog_connector.client.close()
     assert solarlog_connector.client.session.closed
 
@@ -0,0 +1,76 @@
+"""Tests for solarlog_cli - fleet."""
+
+from aioresponses import aioresponses
+
+from solarlog_cli.solarlog_exceptions import SolarLogUpdateError
+from solarlog_cli.solarlog_fleet import SolarLogFleet
+
+from . import load_fixture
+
+
+async def test_poll_once(responses: aioresponses) -> None:
+    """Test polling all Solar-Logs of the fleet once."""
+    responses.post(
+        "http://solarlog1.com/getjp",
+        body=load_fixture("basic_data.json"),
+    )
+    responses.post(
+        "http://solarlog2.com/getjp",
+        status=400,
+    )
+    responses.post(
+        "http://solarlog3.com/getjp",
+        body=load_fixture("basic_data.json").replace('"100":"', '"100":"x'),
+    )
+
+    fleet = SolarLogFleet(max_concurrent_polls=1)
+    fleet.add_host("http://solarlog1.com", tz="UTC")
+    fleet.add_host("http://solarlog2.com")
+    fleet.add_host("http://solarlog3.com")
+
+    assert fleet.connector("http://solarlog2.com").client.session is fleet.session
+
+    results = {result.host: result async for result in fleet.poll_once()}
+
+    assert results["http://solarlog1.com"].data is not None
+    assert results["http://solarlog1.com"].data.power_ac == 2891
+    assert isinstance(results["http://solarlog2.com"].error, SolarLogUpdateError)
+    # malformed data of one Solar-Log does not stop polling the others
+    error = results["http://solarlog3.com"].error
+    assert isinstance(error, SolarLogUpdateError)
+    assert isinstance(error.__cause__, ValueError)
+
+    await fleet.close()
+    assert fleet.session.closed
+
+
+async def test_poll(responses: aioresponses) -> None:
+    """Test polling Solar-Logs of the fleet in their intervals."""
+    responses.post(
+        "http://solarlog1.com/getjp",
+        body=load_fixture("basic_data.json"),
+        repeat=True,
+    )
+    responses.post(
+        "http://solarlog2.com/getjp",
+        body=load_fixture("basic_data.json"),
+        repeat=True,
+    )
+
+    fleet = SolarLogFleet()
+    fleet.add_host("http://solarlog1.com", interval=0)
+    fleet.add_host("http://solarlog2.com", interval=3600)
+
+    hosts: list[str] = []
+    async for result in fleet.poll():
+        hosts.append(result.host)
+        if len(hosts) == 4:
+            break
+
+    assert hosts.count("http://solarlog1.com") == 3
+    assert hosts.count("http://solarlog2.com") == 1
+
+    fleet.remove_host("http://solarlog1.com")
+    assert fleet.hosts == ["http://solarlog2.com"]
+
+    await fleet.close()
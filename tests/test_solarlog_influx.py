@@ -0,0 +1,79 @@
+"""Tests for solarlog_cli - InfluxDB line protocol."""
+
+import asyncio
+from dataclasses import replace
+from datetime import timezone
+import json
+from pathlib import Path
+
+from solarlog_cli.solarlog_client import parse_basic_data
+from solarlog_cli.solarlog_influx import (
+    InfluxFileWriter,
+    InfluxLineBuffer,
+    InfluxSocketWriter,
+)
+from solarlog_cli.solarlog_models import InverterData
+
+from . import load_fixture
+
+DATA = parse_basic_data(json.loads(load_fixture("basic_data.json")))
+DATA.last_updated = DATA.last_updated.replace(tzinfo=timezone.utc)
+
+
+def test_add() -> None:
+    """Test encoding data in line protocol."""
+    buffer = InfluxLineBuffer(max_size=1000)
+    data = replace(
+        DATA,
+        inverter_data={
+            0: InverterData("Inverter 1", True, 100, 1000.5),
+            1: InverterData("Inverter 2"),
+        },
+    )
+
+    assert not buffer.add("http://solar log,1", data)
+    lines = buffer.getvalue().decode().splitlines()
+
+    assert len(lines) == 2
+    assert lines[0].startswith(
+        "solarlog,host=http://solar\\ log\\,1 consumption_ac=3110,consumption_day=47819,"
+    )
+    assert lines[0].endswith(
+        ",yield_total=55543544,alternator_loss=0,power_available=0 1724681985000000000"
+    )
+    assert lines[1] == (
+        "solarlog_inverter,host=http://solar\\ log\\,1,device_id=0,name=Inverter\\ 1 "
+        "current_power=100,consumption_year=1000.5 1724681985000000000"
+    )
+
+    assert buffer.add("http://solarlog2", data)
+
+
+async def test_writers(tmp_path: Path) -> None:
+    """Test flushing lines to file and socket."""
+    buffer = InfluxLineBuffer()
+    buffer.add("http://solarlog", DATA)
+    lines = buffer.getvalue()
+
+    path = tmp_path / "solarlog.lp"
+    await buffer.flush(InfluxFileWriter(path))
+    assert len(buffer) == 0
+    await buffer.flush(InfluxFileWriter(path))
+    assert path.read_bytes() == lines
+
+    received: asyncio.Queue[bytes] = asyncio.Queue()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await received.put(await reader.readline())
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    writer = InfluxSocketWriter("127.0.0.1", server.sockets[0].getsockname()[1])
+
+    buffer.add("http://solarlog", DATA)
+    await buffer.flush(writer)
+    assert await received.get() == lines
+
+    await writer.close()
+    server.close()
+    await server.wait_closed()
@@ -0,0 +1,64 @@
+"""Tests for solarlog_cli - MQTT publisher."""
+
+from dataclasses import replace
+from typing import Any
+
+from solarlog_cli.solarlog_connector import SolarLogConnector
+from solarlog_cli.solarlog_mqtt import SolarLogMqttPublisher
+
+from .emulator import SolarLogEmulator
+
+
+class MockMqttClient:
+    """MQTT client recording publishes."""
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self) -> None:
+        self.messages: dict[str, tuple[Any, int, bool]] = {}
+        self.fail: bool = False
+
+    async def publish(
+        self, topic: str, payload: Any = None, qos: int = 0, retain: bool = False
+    ) -> None:
+        """Record publish."""
+        if self.fail:
+            raise OSError("Broker not reachable")
+        self.messages[topic] = (payload, qos, retain)
+
+
+async def test_publisher() -> None:
+    """Test publishing changed values only."""
+    emulator = SolarLogEmulator(inverters=2)
+    await emulator.start()
+    connector = SolarLogConnector(emulator.url, True, "UTC", {0: True, 1: False})
+    await connector.update_device_list()
+
+    client = MockMqttClient()
+    publisher = SolarLogMqttPublisher(client, qos=1)
+
+    assert await publisher.update(connector, "solarlog/site1") == 26
+    assert client.messages["solarlog/site1/power_ac"] == ("2891", 1, True)
+    assert client.messages["solarlog/site1/last_updated"][0] == "2024-08-26T14:19:45+00:00"
+    assert "solarlog/site1/inverter/0/current_power" in client.messages
+    assert "solarlog/site1/inverter/1/current_power" not in client.messages
+
+    # unchanged data is not published again
+    assert await publisher.update(connector, "solarlog/site1") == 0
+
+    # changes are coalesced until flushed
+    data = await connector.update_data()
+    publisher.set_data("solarlog/site1", replace(data, power_ac=100))
+    publisher.set_data("solarlog/site1", replace(data, power_ac=200))
+    assert publisher.pending == {"solarlog/site1/power_ac": "200"}
+
+    client.fail = True
+    assert await publisher.flush() == 0
+    assert publisher.pending == {"solarlog/site1/power_ac": "200"}
+
+    client.fail = False
+    assert await publisher.flush() == 1
+    assert client.messages["solarlog/site1/power_ac"][0] == "200"
+
+    await connector.client.close()
+    await emulator.stop()
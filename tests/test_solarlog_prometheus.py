@@ -0,0 +1,51 @@
+"""Tests for solarlog_cli - Prometheus exporter."""
+
+from aiohttp import ClientSession
+
+from solarlog_cli.solarlog_connector import SolarLogConnector
+from solarlog_cli.solarlog_prometheus import SolarLogExporter
+
+from .emulator import SolarLogEmulator
+
+
+async def test_exporter() -> None:
+    """Test exposing the latest data of all connectors."""
+    emulator = SolarLogEmulator(inverters=2)
+    await emulator.start()
+
+    connector = SolarLogConnector(emulator.url, True, "UTC", {0: True, 1: False})
+    exporter = SolarLogExporter(port=0)
+    exporter.add_connector(connector)
+    unknown_connector = SolarLogConnector(f"{emulator.url}/unknown/")
+    exporter.add_connector(unknown_connector)
+    await exporter.start()
+
+    await connector.update_device_list()
+    connector.set_enabled_devices({0: True, 1: False})
+    await exporter.update()
+
+    async with ClientSession() as session:
+        response = await session.get(f"{exporter.url}/metrics")
+        text = await response.text()
+
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE solarlog_power_ac gauge" in text
+    assert f'solarlog_power_ac{{host="{emulator.url}"}} 2891\n' in text
+    assert (
+        f'solarlog_inverter_current_power{{host="{emulator.url}",device_id="0",'
+        'name="Device 1"} '
+    ) in text
+    assert 'device_id="1"' not in text
+    assert text.count("# TYPE solarlog_power_ac gauge") == 1
+    assert "/unknown/" not in text
+
+    assert exporter.render() is exporter.render()
+    exporter.remove(emulator.url)
+    assert b"solarlog_power_ac{" not in exporter.render()
+    # pylint: disable-next=protected-access
+    assert not exporter._labels and not exporter._inverter_labels
+
+    await exporter.stop()
+    await connector.client.close()
+    await unknown_connector.client.close()
+    await emulator.stop()
@@ -0,0 +1,74 @@
+"""Tests for solarlog_cli - adaptive poller."""
+
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+import json
+from unittest.mock import Mock
+
+from aioresponses import aioresponses
+from yarl import URL
+
+from solarlog_cli.solarlog_client import parse_basic_data
+from solarlog_cli.solarlog_connector import SolarLogConnector
+from solarlog_cli.solarlog_models import SolarlogData
+from solarlog_cli.solarlog_scheduler import AdaptivePoller
+
+from . import load_fixture
+
+DATA = parse_basic_data(json.loads(load_fixture("basic_data.json")))
+START = datetime(2024, 8, 26, 14, 19, 45, tzinfo=timezone.utc)
+
+
+def _data(seconds: float, power_dc: float = 2991) -> SolarlogData:
+    """Return data last updated seconds after START."""
+    return replace(DATA, last_updated=START + timedelta(seconds=seconds), power_dc=power_dc)
+
+
+def test_observe() -> None:
+    """Test learning the update cycle."""
+    poller = AdaptivePoller(Mock(spec=SolarLogConnector))
+    now = START.timestamp()
+
+    # device clock 100 s ahead, polled 3 s after refresh
+    assert poller.observe(_data(100), now + 3) == poller.initial_interval
+    assert poller.observe(_data(100), now + 13) == poller.initial_interval
+    assert poller.observe(_data(160), now + 64) == 60 + 2 - 1
+    assert poller.cadence == 60
+
+    # expected refresh did not happen yet
+    assert poller.observe(_data(160), now + 126) == poller.retry_interval
+
+    # missed refresh, cadence is not doubled
+    assert poller.observe(_data(280), now + 183) == 72 + 2
+    assert poller.cadence == 72
+
+    # night
+    for seconds in (340, 400):
+        assert poller.observe(_data(seconds, 0), now + seconds - 97) < poller.night_interval
+    assert poller.observe(_data(460, 0), now + 363) == poller.night_interval
+    assert poller.observe(_data(520), now + 423) < poller.night_interval
+
+
+async def test_poll(responses: aioresponses) -> None:
+    """Test polling only yields updated data."""
+    # data, the same data again (not yielded), then updated data
+    unchanged = load_fixture("basic_data.json")
+    updated = load_fixture("basic_data_no_power.json").replace("14:19:45", "14:20:45")
+    for body in (unchanged, unchanged, updated):
+        responses.post("http://solarlog.com/getjp", body=body)
+
+    solarlog_connector = SolarLogConnector("http://solarlog.com")
+    # poll again right away
+    poller = AdaptivePoller(solarlog_connector, initial_interval=0)
+
+    results: list[SolarlogData] = []
+    async for data in poller.poll():
+        results.append(data)
+        if len(results) == 2:
+            break
+
+    assert [data.power_dc for data in results] == [2991, 0]
+    requests = responses.requests[("POST", URL("http://solarlog.com/getjp"))]
+    assert len(requests) == 3
+
+    await solarlog_connector.client.close()
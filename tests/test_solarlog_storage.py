@@ -0,0 +1,71 @@
+"""Tests for solarlog_cli - SQLite storage."""
+
+from dataclasses import replace
+from datetime import timedelta
+import json
+from pathlib import Path
+import sqlite3
+
+import pytest
+
+from solarlog_cli.solarlog_client import parse_basic_data
+from solarlog_cli.solarlog_models import InverterData
+from solarlog_cli.solarlog_storage import SolarLogStorage
+
+from . import load_fixture
+
+DATA = parse_basic_data(json.loads(load_fixture("basic_data.json")))
+
+
+async def test_storage(tmp_path: Path) -> None:
+    """Test writing data in batches."""
+    database = str(tmp_path / "solarlog.db")
+    storage = SolarLogStorage(database, batch_size=2, flush_interval=60)
+
+    data = replace(
+        DATA,
+        inverter_data={
+            0: InverterData("Inverter 1", True, 100, 1000),
+            1: InverterData("Inverter 2", False),
+        },
+    )
+    storage.write("http://solarlog1.com", data)
+    storage.write("http://solarlog2.com", data)
+    storage.write(
+        "http://solarlog1.com",
+        replace(data, last_updated=DATA.last_updated + timedelta(minutes=1)),
+    )
+    await storage.flush()
+
+    connection = sqlite3.connect(database)
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert connection.execute(
+        "SELECT host, power_ac, efficiency FROM snapshots ORDER BY host, last_updated"
+    ).fetchall() == [
+        ("http://solarlog1.com", 2891, None),
+        ("http://solarlog1.com", 2891, None),
+        ("http://solarlog2.com", 2891, None),
+    ]
+    assert connection.execute(
+        "SELECT host, device_id, name, current_power FROM inverters WHERE host LIKE '%2.com'"
+    ).fetchall() == [("http://solarlog2.com", 0, "Inverter 1", 100)]
+
+    storage.write("http://solarlog1.com", data)
+    await storage.close()
+    assert connection.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0] == 3
+
+    connection.close()
+
+
+async def test_storage_not_running(tmp_path: Path) -> None:
+    """Test errors are raised instead of waiting for a stopped thread."""
+    with pytest.raises(sqlite3.OperationalError):
+        SolarLogStorage(str(tmp_path / "missing" / "solarlog.db"))
+
+    storage = SolarLogStorage(str(tmp_path / "solarlog.db"))
+    await storage.close()
+
+    with pytest.raises(RuntimeError):
+        storage.write("http://solarlog1.com", DATA)
+    with pytest.raises(RuntimeError):
+        await storage.flush()
@@ -0,0 +1,77 @@
+"""Tests for solarlog_cli - sync connector."""
+
+import asyncio
+import threading
+
+import pytest
+
+from solarlog_cli.solarlog_exceptions import SolarLogUpdateError
+from solarlog_cli.solarlog_sync import BackgroundLoop, SyncSolarLogConnector, update_many
+
+from .emulator import SolarLogEmulator
+
+
+def test_sync_connector() -> None:
+    """Test blocking calls and polling many Solar-Logs concurrently."""
+    background_loop = BackgroundLoop()
+    emulator = SolarLogEmulator()
+    background_loop.run(emulator.start())
+
+    connector = SyncSolarLogConnector(
+        emulator.url, background_loop, extended_data=True, tz="UTC"
+    )
+    assert connector.test_connection()
+    assert len(connector.update_device_list()) == 4
+    assert connector.update_data().power_ac == 2891
+
+    connectors = [
+        SyncSolarLogConnector(f"{emulator.url}/site{site}", background_loop)
+        for site in range(5)
+    ]
+    connectors.append(SyncSolarLogConnector(f"{emulator.url}/unknown/", background_loop))
+
+    results = update_many(connectors)
+    assert [result.host for result in results] == [item.host for item in connectors]
+    assert all(result.data is not None for result in results[:5])
+    assert isinstance(results[5].error, SolarLogUpdateError)
+
+    shared_connector = SyncSolarLogConnector(emulator.url)
+    assert shared_connector.background_loop is BackgroundLoop.shared()
+    with pytest.raises(ValueError):
+        update_many([connector, shared_connector])
+
+    for item in [connector, shared_connector, *connectors]:
+        item.close()
+    background_loop.run(emulator.stop())
+    background_loop.stop()
+
+
+def test_shared_loop() -> None:
+    """Test the shared loop is kept while running and replaced once stopped."""
+    background_loop = BackgroundLoop.shared()
+    assert background_loop.loop.is_running()
+    assert BackgroundLoop.shared() is background_loop
+
+    background_loop.stop()
+    assert BackgroundLoop.shared() is not background_loop
+    with pytest.raises(RuntimeError):
+        background_loop.run(asyncio.sleep(0))
+
+
+def test_run_timeout() -> None:
+    """Test the coroutine is cancelled once its result is not awaited anymore."""
+    background_loop = BackgroundLoop()
+    cancelled = threading.Event()
+
+    async def poll() -> None:
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(TimeoutError):
+        background_loop.run(poll(), timeout=0.01)
+    assert cancelled.wait(1)
+
+    background_loop.stop()